@@ -0,0 +1,32 @@
+"""
+Minimal event-list simulator for FIFO single-server networks.
+
+Events are plain (time, sequence, event type, payload) tuples on a heapq.
+The sequence number keeps events at the same time in the order they were
+scheduled, as SimPy does. Each event type maps to a handler function that
+may schedule further events; there are no processes or generators.
+"""
+
+import heapq
+from itertools import count
+
+_sequence = count()
+
+
+def schedule(heap, time, etype, payload):
+    """Schedule an event of type `etype` at `time`"""
+    heapq.heappush(heap, (time, next(_sequence), etype, payload))
+
+
+def run(heap, handlers):
+    """Pop events in time order and dispatch them until the heap is empty.
+
+    `handlers[etype]` is called as handler(time, payload). Returns the time
+    of the last event.
+    """
+    heappop = heapq.heappop
+    time = 0.0
+    while heap:
+        time, _, etype, payload = heappop(heap)
+        handlers[etype](time, payload)
+    return time
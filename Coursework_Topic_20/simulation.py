@@ -7,11 +7,25 @@ Complex network with feedback loops:
 - After Comp2 or Comp3: task complete
 """
 
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import simpy
-import random
 import numpy as np
 
+import fast_des
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, the sweep then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # Constants
+SEED = 42
 NUM_TASKS = 200
 ARRIVAL_MEAN = 3
 ARRIVAL_VAR = 1
@@ -34,140 +48,214 @@ P_TO_COMP3 = 0.3
 P_COMP1_TO_COMP2 = 0.3
 P_COMP1_TO_COMP3 = 0.7
 
+# Event trace of the SimPy model, logged at DEBUG level after the run.
+# Enable it with SIM_LOG_LEVEL=DEBUG; below that nothing is recorded.
+log = logging.getLogger(__name__)
+
+EVT_ARRIVED = 0
+EVT_COMP1_DONE = 1
+EVT_DONE_COMP2 = 2
+EVT_DONE_COMP3 = 3
+
+EVENT_FORMATS = {
+    EVT_ARRIVED: "Task %d arrived",
+    EVT_COMP1_DONE: "Task %d completed at Computer 1 (queue: %.2f min, process: %.2f min)",
+    EVT_DONE_COMP2: "Task %d COMPLETED at Computer 2 (total: %.2f min)",
+    EVT_DONE_COMP3: "Task %d COMPLETED at Computer 3 (total: %.2f min)",
+}
+
+
+def draw_samples(seed=SEED, n=NUM_TASKS):
+    """Draw every random value of a run up front, one block per distribution.
+    
+    Both models take their samples from here, so a seed gives the same tasks
+    in the SimPy model and in the NumPy sweep. Returns the interarrival
+    times, the service times at the three computers, the initial route
+    (0 = Comp1, 1 = Comp2, 2 = Comp3) and the route after Computer 1
+    (0 = Comp2, 1 = Comp3).
+    """
+    rng = np.random.default_rng(seed)
+    interarrivals = rng.uniform(ARRIVAL_MEAN - ARRIVAL_VAR,
+                                ARRIVAL_MEAN + ARRIVAL_VAR, n)
+    t1 = rng.uniform(T1_MIN, T1_MAX, n)
+    t2 = rng.uniform(T2_MIN, T2_MAX, n)
+    t3 = rng.uniform(T3_MIN, T3_MAX, n)
+    routes = np.searchsorted([P_TO_COMP1, P_TO_COMP1 + P_TO_COMP2],
+                             rng.random(n), side='right')
+    routes_c1 = (rng.random(n) >= P_COMP1_TO_COMP2).astype(np.int8)
+    return interarrivals, t1, t2, t3, routes, routes_c1
+
 
 class ComputerSystem:
-    def __init__(self, env):
+    def __init__(self, env, seed=SEED):
         self.env = env
         
-        # Three computers as resources
-        self.comp1 = simpy.Resource(env, capacity=1)
-        self.comp2 = simpy.Resource(env, capacity=1)
-        self.comp3 = simpy.Resource(env, capacity=1)
+        # Time at which each computer is next free. Each one is a FIFO
+        # single server, so a scalar replaces the SimPy queue.
+        self._comp1_free = 0.0
+        self._comp2_free = 0.0
+        self._comp3_free = 0.0
         
         # Statistics
         self.tasks_generated = 0
         self.tasks_completed = 0
         
-        # Routing counters
-        self.initial_to_comp1 = 0
-        self.initial_to_comp2 = 0
-        self.initial_to_comp3 = 0
+        # Routing counters, indexed like the routes:
+        # initial (Comp1, Comp2, Comp3) and after Comp1 (Comp2, Comp3)
+        self.initial_counts = np.zeros(3, dtype=np.int64)
+        self.comp1_counts = np.zeros(2, dtype=np.int64)
         
-        self.comp1_to_comp2 = 0
-        self.comp1_to_comp3 = 0
+        # Route index -> process started for the task
+        self._route_fn = (self.process_at_comp1, self.process_at_comp2,
+                          self.process_at_comp3)
+        self._route_c1_fn = (self.process_at_comp2, self.process_at_comp3)
         
         self.completed_at_comp2 = 0
         self.completed_at_comp3 = 0
         
-        # Timing statistics
-        self.total_times = []
-        self.comp1_times = []
-        self.comp2_times = []
-        self.comp3_times = []
-        self.queue_times_comp1 = []
-        self.queue_times_comp2 = []
-        self.queue_times_comp3 = []
+        # Timing statistics, preallocated and filled by the counters below
+        self.total_times = np.empty(NUM_TASKS)
+        self.comp1_times = np.empty(NUM_TASKS)
+        self.comp2_times = np.empty(NUM_TASKS)
+        self.comp3_times = np.empty(NUM_TASKS)
+        self.queue_times_comp1 = np.empty(NUM_TASKS)
+        self.queue_times_comp2 = np.empty(NUM_TASKS)
+        self.queue_times_comp3 = np.empty(NUM_TASKS)
+        
+        # Number of services started at each computer
+        self._n1 = 0
+        self._n2 = 0
+        self._n3 = 0
+        
+        # (time, event code, task id, *values) records when tracing
+        self._trace = log.isEnabledFor(logging.DEBUG)
+        self.events = []
+        
+        # Random values drawn up front, indexed by task
+        (self._interarrivals, self._t1, self._t2, self._t3,
+         self._routes, self._routes_c1) = draw_samples(seed)
         
     def task_arrival(self):
         """Generate tasks every (3 +/- 1) minutes"""
+        env = self.env
+        timeout = env.timeout
+        process = env.process
+        interarrivals = self._interarrivals
+        routes = self._routes
+        route_fn = self._route_fn
+        initial_counts = self.initial_counts
+        
         while self.tasks_generated < NUM_TASKS:
-            interarrival = random.uniform(ARRIVAL_MEAN - ARRIVAL_VAR, 
-                                         ARRIVAL_MEAN + ARRIVAL_VAR)
-            yield self.env.timeout(interarrival)
+            yield timeout(interarrivals[self.tasks_generated])
             
             self.tasks_generated += 1
             task_id = self.tasks_generated
-            arrival_time = self.env.now
+            arrival_time = env.now
             
-            print(f"[{self.env.now:.2f}] Task {task_id} arrived")
+            if self._trace:
+                self.events.append((arrival_time, EVT_ARRIVED, task_id))
             
-            # Route based on probabilities
-            p = random.random()
-            if p < P_TO_COMP1:
-                self.initial_to_comp1 += 1
-                self.env.process(self.process_at_comp1(task_id, arrival_time))
-            elif p < P_TO_COMP1 + P_TO_COMP2:
-                self.initial_to_comp2 += 1
-                self.env.process(self.process_at_comp2(task_id, arrival_time, final=True))
-            else:
-                self.initial_to_comp3 += 1
-                self.env.process(self.process_at_comp3(task_id, arrival_time, final=True))
+            # Route based on the pre-drawn decision
+            route = routes[task_id - 1]
+            initial_counts[route] += 1
+            process(route_fn[route](task_id, arrival_time))
     
     def process_at_comp1(self, task_id, arrival_time):
         """Process at Computer 1, then route to Comp2 or Comp3"""
-        queue_start = self.env.now
+        env = self.env
+        now = env.now
         
-        with self.comp1.request() as req:
-            yield req
-            queue_time = self.env.now - queue_start
-            self.queue_times_comp1.append(queue_time)
-            
-            # Processing: 4 +/- 1 minutes
-            processing_time = random.uniform(T1_MIN, T1_MAX)
-            yield self.env.timeout(processing_time)
-            
-            self.comp1_times.append(processing_time)
-            print(f"[{self.env.now:.2f}] Task {task_id} completed at Computer 1 "
-                  f"(queue: {queue_time:.2f} min, process: {processing_time:.2f} min)")
+        # Processing: 4 +/- 1 minutes
+        processing_time = self._t1[task_id - 1]
+        start = max(now, self._comp1_free)
+        finish = self._comp1_free = start + processing_time
+        queue_time = start - now
+        
+        n = self._n1
+        self._n1 = n + 1
+        self.queue_times_comp1[n] = queue_time
+        self.comp1_times[n] = processing_time
+        
+        yield env.timeout(finish - now)
+        if self._trace:
+            self.events.append((env.now, EVT_COMP1_DONE, task_id,
+                                queue_time, processing_time))
         
         # Route after Comp1: 0.3 to Comp2, 0.7 to Comp3
-        p = random.random()
-        if p < P_COMP1_TO_COMP2:
-            self.comp1_to_comp2 += 1
-            self.env.process(self.process_at_comp2(task_id, arrival_time, final=True))
-        else:
-            self.comp1_to_comp3 += 1
-            self.env.process(self.process_at_comp3(task_id, arrival_time, final=True))
+        route = self._routes_c1[task_id - 1]
+        self.comp1_counts[route] += 1
+        env.process(self._route_c1_fn[route](task_id, arrival_time))
     
-    def process_at_comp2(self, task_id, arrival_time, final=False):
+    def process_at_comp2(self, task_id, arrival_time):
         """Process at Computer 2, task completes here"""
-        queue_start = self.env.now
+        env = self.env
+        now = env.now
         
-        with self.comp2.request() as req:
-            yield req
-            queue_time = self.env.now - queue_start
-            self.queue_times_comp2.append(queue_time)
-            
-            # Processing: 3 +/- 1 minutes
-            processing_time = random.uniform(T2_MIN, T2_MAX)
-            yield self.env.timeout(processing_time)
-            
-            self.comp2_times.append(processing_time)
-            total_time = self.env.now - arrival_time
-            
-            if final:
-                self.completed_at_comp2 += 1
-                self.tasks_completed += 1
-                self.total_times.append(total_time)
-                print(f"[{self.env.now:.2f}] Task {task_id} COMPLETED at Computer 2 "
-                      f"(total: {total_time:.2f} min)")
-    
-    def process_at_comp3(self, task_id, arrival_time, final=False):
+        # Processing: 3 +/- 1 minutes
+        processing_time = self._t2[task_id - 1]
+        start = max(now, self._comp2_free)
+        finish = self._comp2_free = start + processing_time
+        
+        n = self._n2
+        self._n2 = n + 1
+        self.queue_times_comp2[n] = start - now
+        self.comp2_times[n] = processing_time
+        
+        yield env.timeout(finish - now)
+        total_time = env.now - arrival_time
+        
+        self.completed_at_comp2 += 1
+        completed = self.tasks_completed
+        self.total_times[completed] = total_time
+        self.tasks_completed = completed + 1
+        if self._trace:
+            self.events.append((env.now, EVT_DONE_COMP2, task_id, total_time))
+    
+    def process_at_comp3(self, task_id, arrival_time):
         """Process at Computer 3, task completes here"""
-        queue_start = self.env.now
+        env = self.env
+        now = env.now
         
-        with self.comp3.request() as req:
-            yield req
-            queue_time = self.env.now - queue_start
-            self.queue_times_comp3.append(queue_time)
-            
-            # Processing: 5 +/- 2 minutes
-            processing_time = random.uniform(T3_MIN, T3_MAX)
-            yield self.env.timeout(processing_time)
-            
-            self.comp3_times.append(processing_time)
-            total_time = self.env.now - arrival_time
-            
-            if final:
-                self.completed_at_comp3 += 1
-                self.tasks_completed += 1
-                self.total_times.append(total_time)
-                print(f"[{self.env.now:.2f}] Task {task_id} COMPLETED at Computer 3 "
-                      f"(total: {total_time:.2f} min)")
+        # Processing: 5 +/- 2 minutes
+        processing_time = self._t3[task_id - 1]
+        start = max(now, self._comp3_free)
+        finish = self._comp3_free = start + processing_time
+        
+        n = self._n3
+        self._n3 = n + 1
+        self.queue_times_comp3[n] = start - now
+        self.comp3_times[n] = processing_time
+        
+        yield env.timeout(finish - now)
+        total_time = env.now - arrival_time
+        
+        self.completed_at_comp3 += 1
+        completed = self.tasks_completed
+        self.total_times[completed] = total_time
+        self.tasks_completed = completed + 1
+        if self._trace:
+            self.events.append((env.now, EVT_DONE_COMP3, task_id, total_time))
+
+    
+    def finalize(self):
+        """Trim the statistics arrays to the samples actually recorded"""
+        self.total_times = self.total_times[:self.tasks_completed]
+        self.comp1_times = self.comp1_times[:self._n1]
+        self.comp2_times = self.comp2_times[:self._n2]
+        self.comp3_times = self.comp3_times[:self._n3]
+        self.queue_times_comp1 = self.queue_times_comp1[:self._n1]
+        self.queue_times_comp2 = self.queue_times_comp2[:self._n2]
+        self.queue_times_comp3 = self.queue_times_comp3[:self._n3]
+
+
+def log_events(events):
+    """Log the recorded event trace"""
+    for time, code, *values in events:
+        log.debug("[%.2f] " + EVENT_FORMATS[code], time, *values)
 
 
-def run_simulation():
-    """Run the three-computer system simulation"""
+def print_header():
+    """Print the model parameters"""
     print("=" * 70)
     print("TOPIC 20: THREE-COMPUTER SYSTEM WITH PROBABILISTIC ROUTING")
     print("=" * 70)
@@ -177,17 +265,229 @@ def run_simulation():
     print(f"After Comp1: 0.3->Comp2, 0.7->Comp3")
     print(f"Processing: T1=[{T1_MIN},{T1_MAX}], T2=[{T2_MIN},{T2_MAX}], T3=[{T3_MIN},{T3_MAX}]")
     print("=" * 70)
+
+
+def run_simulation(seed=SEED):
+    """Run the three-computer system simulation (SimPy model)"""
+    # Trace level from the environment, e.g. SIM_LOG_LEVEL=DEBUG
+    logging.basicConfig(level=os.environ.get("SIM_LOG_LEVEL", "WARNING").upper(),
+                        format="%(message)s", stream=sys.stdout)
+    
+    print_header()
     
     env = simpy.Environment()
-    system = ComputerSystem(env)
+    system = ComputerSystem(env, seed)
     
     # Start task arrival
     env.process(system.task_arrival())
     
-    # Run until all tasks are completed
-    while system.tasks_completed < NUM_TASKS:
-        env.step()
+    # The source stops after the last arrival, so the event queue drains
+    # once every task has completed
+    env.run()
+    system.finalize()
+    
+    log_events(system.events)
+    report_results(system)
+    return system
+
+
+class FastResults:
+    """Statistics of a vectorized run, with the same fields as ComputerSystem"""
+
+
+@njit(cache=True, fastmath=True)
+def _sweep(arrivals, t1, t2, t3, route_init, route_c1):
+    """Sweep tasks through the three FIFO servers.
+    
+    route_init holds 0/1/2 for Comp1/Comp2/Comp3 and route_c1 holds 0/1 for
+    Comp2/Comp3 after Comp1. Returns the total time of every task and the
+    queue times at each computer in service order.
+    """
+    n = arrivals.shape[0]
+    ready = arrivals.copy()  # time each task reaches its final computer
+    final = np.empty(n, np.int64)
+    queue1 = np.empty(n)
+    k1 = 0
+    free1 = 0.0
+    
+    # Computer 1 is fed in arrival order
+    for i in range(n):
+        if route_init[i] == 0:
+            start = max(arrivals[i], free1)
+            queue1[k1] = start - arrivals[i]
+            k1 += 1
+            free1 = start + t1[i]
+            ready[i] = free1
+            final[i] = 1 + route_c1[i]
+        else:
+            final[i] = route_init[i]
+    
+    # Computers 2 and 3 see tasks in the order they reach them
+    order = np.argsort(ready, kind='mergesort')
+    total_times = np.empty(n)
+    queue2 = np.empty(n)
+    queue3 = np.empty(n)
+    k2 = 0
+    k3 = 0
+    free2 = 0.0
+    free3 = 0.0
+    for j in range(n):
+        i = order[j]
+        if final[i] == 1:
+            start = max(ready[i], free2)
+            queue2[k2] = start - ready[i]
+            k2 += 1
+            free2 = start + t2[i]
+            total_times[i] = free2 - arrivals[i]
+        else:
+            start = max(ready[i], free3)
+            queue3[k3] = start - ready[i]
+            k3 += 1
+            free3 = start + t3[i]
+            total_times[i] = free3 - arrivals[i]
+    
+    return total_times, queue1[:k1], queue2[:k2], queue3[:k3]
+
+
+def run_fast(seed=SEED):
+    """Run the network as a NumPy sweep and report the results"""
+    print_header()
+    results = simulate_fast(seed)
+    report_results(results)
+    return results
+
+
+def simulate_fast(seed=SEED):
+    """Run the same network as a sweep over pre-sampled NumPy arrays.
+    
+    Every computer is a single FIFO server, so a task's start time only
+    depends on its arrival at that computer and on when the server frees up.
+    Computer 1 is fed in arrival order; Computers 2 and 3 see direct arrivals
+    merged with tasks forwarded from Computer 1, so they are swept in order
+    of the time each task reaches them. Nothing is printed.
+    """
+    n = NUM_TASKS
+    interarrivals, t1, t2, t3, routes, route_c1 = draw_samples(seed, n)
+    arrivals = interarrivals.cumsum()
+    
+    total_times, queue1, queue2, queue3 = _sweep(arrivals, t1, t2, t3,
+                                                 routes, route_c1)
+    at1 = routes == 0
+    at2 = (routes == 1) | (at1 & (route_c1 == 0))
+    at3 = (routes == 2) | (at1 & (route_c1 == 1))
+    
+    results = FastResults()
+    results.tasks_generated = n
+    results.tasks_completed = n
+    results.initial_counts = np.bincount(routes, minlength=3)
+    results.comp1_counts = np.bincount(route_c1[at1], minlength=2)
+    results.completed_at_comp2 = int(np.count_nonzero(at2))
+    results.completed_at_comp3 = int(np.count_nonzero(at3))
+    results.total_times = total_times
+    results.comp1_times = t1[at1]
+    results.comp2_times = t2[at2]
+    results.comp3_times = t3[at3]
+    results.queue_times_comp1 = queue1
+    results.queue_times_comp2 = queue2
+    results.queue_times_comp3 = queue3
+    return results
+
+
+def run_des(seed=SEED):
+    """Run the network on the heapq event list of fast_des, without SimPy.
     
+    The state transitions are those of the SimPy model: an arrival books the
+    computer it is routed to, and a done event at Computer 1 books Computer 2
+    or 3. Computers are booked through next-free-time scalars, as in
+    ComputerSystem, so each task needs one event per computer it visits.
+    """
+    print_header()
+    
+    interarrivals, t1, t2, t3, routes, routes_c1 = draw_samples(seed)
+    service = (t1, t2, t3)
+    done_events = (EVT_COMP1_DONE, EVT_DONE_COMP2, EVT_DONE_COMP3)
+    
+    results = FastResults()
+    results.tasks_generated = 0
+    results.tasks_completed = 0
+    results.initial_counts = np.zeros(3, dtype=np.int64)
+    results.comp1_counts = np.zeros(2, dtype=np.int64)
+    results.total_times = np.empty(NUM_TASKS)
+    
+    # Per computer: next free time, services started, queue and service times
+    free = [0.0, 0.0, 0.0]
+    served = [0, 0, 0]
+    queue_times = [np.empty(NUM_TASKS) for _ in range(3)]
+    service_times = [np.empty(NUM_TASKS) for _ in range(3)]
+    arrival_times = np.empty(NUM_TASKS)
+    heap = []
+    
+    def book(time, k, i):
+        """Queue task i at computer k and schedule its done event"""
+        start = max(time, free[k])
+        free[k] = start + service[k][i]
+        n = served[k]
+        served[k] = n + 1
+        queue_times[k][n] = start - time
+        service_times[k][n] = service[k][i]
+        fast_des.schedule(heap, free[k], done_events[k], i)
+    
+    def arrival(time, i):
+        arrival_times[i] = time
+        results.tasks_generated += 1
+        if i + 1 < NUM_TASKS:
+            fast_des.schedule(heap, time + interarrivals[i + 1], EVT_ARRIVED, i + 1)
+        route = routes[i]
+        results.initial_counts[route] += 1
+        book(time, route, i)
+    
+    def comp1_done(time, i):
+        route = routes_c1[i]
+        results.comp1_counts[route] += 1
+        book(time, route + 1, i)
+    
+    def task_done(time, i):
+        results.total_times[results.tasks_completed] = time - arrival_times[i]
+        results.tasks_completed += 1
+    
+    # Indexed by the EVT_* codes
+    handlers = (arrival, comp1_done, task_done, task_done)
+    fast_des.schedule(heap, interarrivals[0], EVT_ARRIVED, 0)
+    fast_des.run(heap, handlers)
+    
+    results.completed_at_comp2 = served[1]
+    results.completed_at_comp3 = served[2]
+    results.total_times = results.total_times[:results.tasks_completed]
+    results.comp1_times, results.comp2_times, results.comp3_times = (
+        times[:n] for times, n in zip(service_times, served))
+    results.queue_times_comp1, results.queue_times_comp2, results.queue_times_comp3 = (
+        times[:n] for times, n in zip(queue_times, served))
+    
+    report_results(results)
+    return results
+
+
+def run_many(n_reps):
+    """Run independent replications in parallel, one seed per replication"""
+    seeds = range(SEED, SEED + n_reps)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(simulate_fast, seeds))
+    
+    total_times = np.concatenate([r.total_times for r in results])
+    means = np.array([np.mean(r.total_times) for r in results])
+    
+    print_header()
+    print(f"\nReplications: {n_reps} (seeds {SEED}..{SEED + n_reps - 1})")
+    print(f"  Total time per task: avg={np.mean(total_times):.2f} min, "
+          f"min={np.min(total_times):.2f} min, max={np.max(total_times):.2f} min")
+    if n_reps > 1:
+        half_width = 1.96 * means.std(ddof=1) / np.sqrt(n_reps)
+        print(f"  95% CI of the mean: {means.mean():.2f} +/- {half_width:.2f} min")
+    return results
+
+
+def report_results(system):
+    """Print the statistics and save the summary to simulation_results.txt"""
     # Print results
     print("\n" + "=" * 70)
     print("SIMULATION RESULTS")
@@ -198,39 +498,38 @@ def run_simulation():
     print(f"  Tasks completed: {system.tasks_completed}")
     
     print(f"\nInitial Routing:")
-    print(f"  To Computer 1: {system.initial_to_comp1} ({system.initial_to_comp1/system.tasks_generated*100:.1f}%)")
-    print(f"  To Computer 2: {system.initial_to_comp2} ({system.initial_to_comp2/system.tasks_generated*100:.1f}%)")
-    print(f"  To Computer 3: {system.initial_to_comp3} ({system.initial_to_comp3/system.tasks_generated*100:.1f}%)")
+    for k, count in enumerate(system.initial_counts, start=1):
+        print(f"  To Computer {k}: {count} ({count/system.tasks_generated*100:.1f}%)")
     
     print(f"\nRouting from Computer 1:")
-    total_from_comp1 = system.comp1_to_comp2 + system.comp1_to_comp3
-    print(f"  To Computer 2: {system.comp1_to_comp2} ({system.comp1_to_comp2/total_from_comp1*100:.1f}%)")
-    print(f"  To Computer 3: {system.comp1_to_comp3} ({system.comp1_to_comp3/total_from_comp1*100:.1f}%)")
+    total_from_comp1 = system.comp1_counts.sum()
+    for k, count in enumerate(system.comp1_counts, start=2):
+        print(f"  To Computer {k}: {count} ({count/total_from_comp1*100:.1f}%)")
     
     print(f"\nTask Completion:")
     print(f"  At Computer 2: {system.completed_at_comp2} ({system.completed_at_comp2/system.tasks_completed*100:.1f}%)")
     print(f"  At Computer 3: {system.completed_at_comp3} ({system.completed_at_comp3/system.tasks_completed*100:.1f}%)")
     
     print(f"\nTiming Statistics:")
-    if system.total_times:
+    if len(system.total_times):
         print(f"  Total time per task: avg={np.mean(system.total_times):.2f} min, "
               f"min={np.min(system.total_times):.2f} min, max={np.max(system.total_times):.2f} min")
     
-    if system.queue_times_comp1:
+    if len(system.queue_times_comp1):
         print(f"  Computer 1 queue: avg={np.mean(system.queue_times_comp1):.2f} min, "
               f"max={np.max(system.queue_times_comp1):.2f} min")
-    if system.queue_times_comp2:
+    if len(system.queue_times_comp2):
         print(f"  Computer 2 queue: avg={np.mean(system.queue_times_comp2):.2f} min, "
               f"max={np.max(system.queue_times_comp2):.2f} min")
-    if system.queue_times_comp3:
+    if len(system.queue_times_comp3):
         print(f"  Computer 3 queue: avg={np.mean(system.queue_times_comp3):.2f} min, "
               f"max={np.max(system.queue_times_comp3):.2f} min")
     
-    if system.comp1_times:
+    if len(system.comp1_times):
         print(f"  Computer 1 processing: avg={np.mean(system.comp1_times):.2f} min")
-    if system.comp2_times:
+    if len(system.comp2_times):
         print(f"  Computer 2 processing: avg={np.mean(system.comp2_times):.2f} min")
-    if system.comp3_times:
+    if len(system.comp3_times):
         print(f"  Computer 3 processing: avg={np.mean(system.comp3_times):.2f} min")
     
     # Save results
@@ -239,19 +538,31 @@ def run_simulation():
         f.write("=" * 50 + "\n")
         f.write(f"Tasks generated: {system.tasks_generated}\n")
         f.write(f"Tasks completed: {system.tasks_completed}\n")
-        f.write(f"Initial to Comp1: {system.initial_to_comp1}\n")
-        f.write(f"Initial to Comp2: {system.initial_to_comp2}\n")
-        f.write(f"Initial to Comp3: {system.initial_to_comp3}\n")
-        f.write(f"Comp1->Comp2: {system.comp1_to_comp2}\n")
-        f.write(f"Comp1->Comp3: {system.comp1_to_comp3}\n")
+        for k, count in enumerate(system.initial_counts, start=1):
+            f.write(f"Initial to Comp{k}: {count}\n")
+        for k, count in enumerate(system.comp1_counts, start=2):
+            f.write(f"Comp1->Comp{k}: {count}\n")
         f.write(f"Completed at Comp2: {system.completed_at_comp2}\n")
         f.write(f"Completed at Comp3: {system.completed_at_comp3}\n")
-        if system.total_times:
+        if len(system.total_times):
             f.write(f"Avg total time: {np.mean(system.total_times):.2f} min\n")
-    
-    return system
 
 
 if __name__ == "__main__":
-    random.seed(42)
-    run_simulation()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--legacy", action="store_true",
+                        help="run the original SimPy model instead of the NumPy sweep")
+    parser.add_argument("--des", action="store_true",
+                        help="run the heapq event-list simulator instead of the NumPy sweep")
+    parser.add_argument("--replications", type=int, default=0,
+                        help="run this many NumPy replications in parallel")
+    args = parser.parse_args()
+    
+    if args.replications > 0:
+        run_many(args.replications)
+    elif args.legacy:
+        run_simulation()
+    elif args.des:
+        run_des()
+    else:
+        run_fast()
@@ -6,12 +6,19 @@ Complex distributed system with 3 remote centers (A, B, C)
 - Response collection from all centers required
 """
 
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import simpy
-import random
 import numpy as np
 
 # Constants
+SEED = 42
 NUM_REQUESTS = 150
+BATCH_SIZE = 1000  # Replications vectorized together in one worker
 ARRIVAL_MEAN = 12
 ARRIVAL_VAR = 5
 
@@ -33,175 +40,282 @@ CENTER_B_MAX = 15
 CENTER_C_MIN = 4   # 8 +/- 4
 CENTER_C_MAX = 12
 
+# Event trace of the SimPy model, logged at DEBUG level after the run.
+# Enable it with SIM_LOG_LEVEL=DEBUG; below that nothing is recorded.
+log = logging.getLogger(__name__)
+
+EVT_ARRIVED = 0
+EVT_PREPROCESSED = 1
+EVT_SEARCH_DONE = 2
+EVT_RESPONSE_RECEIVED = 3
+EVT_ALL_RESPONSES = 4
+EVT_COMPLETED = 5
+
+EVENT_FORMATS = {
+    EVT_ARRIVED: "Request %d arrived",
+    EVT_PREPROCESSED: "Request %d preprocessing complete (took %.2f min)",
+    EVT_SEARCH_DONE: "Request %d Center %s search complete",
+    EVT_RESPONSE_RECEIVED: "Request %d Center %s response received",
+    EVT_ALL_RESPONSES: "Request %d all center responses received (query phase took %.2f min)",
+    EVT_COMPLETED: "Request %d COMPLETED (total time: %.2f min)",
+}
+
+
+def draw_samples(seed=SEED, n=NUM_REQUESTS):
+    """Draw every random value of a run up front, one block per distribution.
+    
+    The SimPy model and run_batch both take their samples from here, so a
+    seed gives the same requests in either. Returns the interarrival times,
+    the preprocessing times and the search times at centers A, B and C.
+    """
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(ARRIVAL_MEAN - ARRIVAL_VAR, ARRIVAL_MEAN + ARRIVAL_VAR, n),
+            rng.uniform(PREPROCESS_MIN, PREPROCESS_MAX, n),
+            rng.uniform(CENTER_A_MIN, CENTER_A_MAX, n),
+            rng.uniform(CENTER_B_MIN, CENTER_B_MAX, n),
+            rng.uniform(CENTER_C_MIN, CENTER_C_MAX, n))
+
 
 class DistributedDatabaseSystem:
-    def __init__(self, env):
+    def __init__(self, env, seed=SEED):
         self.env = env
         
-        # Central computer for preprocessing
-        self.central_computer = simpy.Resource(env, capacity=1)
-        
-        # Three remote centers
-        self.center_a = simpy.Resource(env, capacity=1)
-        self.center_b = simpy.Resource(env, capacity=1)
-        self.center_c = simpy.Resource(env, capacity=1)
-        
-        # Communication channels (duplex)
-        self.outgoing_channel = simpy.Resource(env, capacity=1)
-        self.incoming_channel = simpy.Resource(env, capacity=1)
+        # Times at which the central computer, the three remote centers
+        # (A, B, C) and the two directions of the duplex channel are next
+        # free. They are FIFO single servers fed in time order, so a scalar
+        # replaces the queue.
+        self._central_free = 0.0
+        self._center_free = [0.0, 0.0, 0.0]
+        self._outgoing_free = 0.0
+        self._incoming_free = 0.0
         
         # Statistics
         self.requests_generated = 0
         self.requests_completed = 0
+        self.requests_uncontended = 0
         
-        # Timing statistics
-        self.total_times = []
-        self.preprocess_times = []
-        self.query_times_a = []
-        self.query_times_b = []
-        self.query_times_c = []
-        self.wait_times_center_a = []
-        self.wait_times_center_b = []
-        self.wait_times_center_c = []
+        # Requests between arrival and completion
+        self._in_flight = 0
+        
+        # Timing statistics, preallocated and filled by the counters below
+        self.total_times = np.empty(NUM_REQUESTS)
+        self.preprocess_times = np.empty(NUM_REQUESTS)
+        self.query_times_a = np.empty(NUM_REQUESTS)
+        self.query_times_b = np.empty(NUM_REQUESTS)
+        self.query_times_c = np.empty(NUM_REQUESTS)
+        self.wait_times_center_a = np.empty(NUM_REQUESTS)
+        self.wait_times_center_b = np.empty(NUM_REQUESTS)
+        self.wait_times_center_c = np.empty(NUM_REQUESTS)
+        
+        # Number of preprocessing runs and of query rounds (one search at
+        # every center each)
+        self._n_pre = 0
+        self._n_queries = 0
+        
+        # (time, event code, request id, *values) records when tracing
+        self._trace = log.isEnabledFor(logging.DEBUG)
+        self.events = []
+        
+        # Random values drawn up front, indexed by request
+        (self._interarrivals, self._preprocess,
+         self._search_a, self._search_b, self._search_c) = draw_samples(seed)
     
     def request_generator(self):
         """Generate requests every (12 +/- 5) minutes"""
+        env = self.env
+        timeout = env.timeout
+        process = env.process
+        interarrivals = self._interarrivals
+        
         while self.requests_generated < NUM_REQUESTS:
-            interarrival = random.uniform(ARRIVAL_MEAN - ARRIVAL_VAR,
-                                         ARRIVAL_MEAN + ARRIVAL_VAR)
-            yield self.env.timeout(interarrival)
+            yield timeout(interarrivals[self.requests_generated])
             
             self.requests_generated += 1
             request_id = self.requests_generated
-            arrival_time = self.env.now
+            arrival_time = env.now
             
-            print(f"[{self.env.now:.2f}] Request {request_id} arrived")
+            if self._trace:
+                self.events.append((arrival_time, EVT_ARRIVED, request_id))
             
             # Start processing the request
-            self.env.process(self.process_request(request_id, arrival_time))
+            process(self.process_request(request_id, arrival_time))
+    
+    def critical_path(self, request_id, start):
+        """Stage completion times of a request that never waits for another.
+        
+        Returns the preprocessing end, the search end at each center and the
+        time each response is received; the own three responses still queue
+        for the incoming channel in the order the searches finish.
+        """
+        i = request_id - 1
+        preprocess_done = start + self._preprocess[i]
+        searches = (self._search_a[i], self._search_b[i], self._search_c[i])
+        search_done = [preprocess_done + (k + 1) * OUTGOING_CHANNEL_TIME + search
+                       for k, search in enumerate(searches)]
+        
+        received = [0.0] * 3
+        channel_free = start
+        for k in sorted(range(3), key=search_done.__getitem__):
+            channel_free = max(search_done[k], channel_free) + INCOMING_CHANNEL_TIME
+            received[k] = channel_free
+        return preprocess_done, search_done, received
     
     def process_request(self, request_id, arrival_time):
         """Process a request through the distributed system"""
+        env = self.env
+        timeout = env.timeout
+        
+        # Fast path: if the system is empty and the next request arrives only
+        # after this one is done, nothing can queue ahead of it or compete
+        # for its resources, so its timeline is known in closed form.
+        if self._in_flight == 0:
+            preprocess_done, search_done, received = self.critical_path(
+                request_id, arrival_time)
+            finish = max(received)
+            if (request_id == NUM_REQUESTS or
+                    arrival_time + self._interarrivals[request_id] > finish):
+                self._in_flight += 1
+                yield timeout(finish - arrival_time)
+                self.record_uncontended(request_id, preprocess_done,
+                                        search_done, received)
+                self.requests_uncontended += 1
+                self.complete_request(request_id, arrival_time, preprocess_done)
+                return
+        self._in_flight += 1
+        
         # Step 1: Preprocessing at central computer
-        preprocess_start = self.env.now
+        now = env.now
+        preprocess_time = self._preprocess[request_id - 1]
+        preprocess_done = self._central_free = (max(now, self._central_free) +
+                                                preprocess_time)
+        n = self._n_pre
+        self.preprocess_times[n] = preprocess_time
+        self._n_pre = n + 1
+        yield timeout(preprocess_done - now)
         
-        with self.central_computer.request() as req:
-            yield req
-            preprocess_time = random.uniform(PREPROCESS_MIN, PREPROCESS_MAX)
-            yield self.env.timeout(preprocess_time)
-            self.preprocess_times.append(preprocess_time)
+        # Step 2: Send queries to all 3 centers and wait for the searches
+        query_start = env.now
+        if self._trace:
+            self.events.append((query_start, EVT_PREPROCESSED, request_id,
+                                preprocess_time))
+        search_done = self.send_queries(request_id)
         
-        print(f"[{self.env.now:.2f}] Request {request_id} preprocessing complete "
-              f"(took {preprocess_time:.2f} min)")
+        # Step 3: Responses share the incoming channel with every other
+        # request in the order the searches finish, so each one is booked
+        # only once its search is done
+        receive_response = self.receive_response
+        received = [0.0] * 3
+        for k in sorted(range(3), key=search_done.__getitem__):
+            yield timeout(search_done[k] - env.now)
+            received[k] = receive_response()
+        yield timeout(max(received) - env.now)
         
-        # Step 2: Send queries to all 3 centers in parallel via outgoing channels
-        # Each query transmission takes 1 minute
-        query_start = self.env.now
+        if self._trace:
+            events = self.events
+            for center, done, back in zip('ABC', search_done, received):
+                events.append((done, EVT_SEARCH_DONE, request_id, center))
+                events.append((back, EVT_RESPONSE_RECEIVED, request_id, center))
         
-        # Send queries to centers (can be parallel since different channels conceptually)
-        query_a = self.env.process(self.query_center_a(request_id))
-        query_b = self.env.process(self.query_center_b(request_id))
-        query_c = self.env.process(self.query_center_c(request_id))
+        self.complete_request(request_id, arrival_time, query_start)
+    
+    def send_queries(self, request_id):
+        """Reserve the outgoing channel and the three centers for a request.
         
-        # Wait for all queries to complete
-        results = yield simpy.AllOf(self.env, [query_a, query_b, query_c])
+        Each query transmission takes 1 minute and the three of a request go
+        out back to back. Queries leave in request order and every center
+        serves them FIFO, so the search end at each center is known as soon
+        as preprocessing is done.
+        """
+        i = request_id - 1
+        send_start = max(self.env.now, self._outgoing_free)
+        self._outgoing_free = send_start + 3 * OUTGOING_CHANNEL_TIME
         
+        n = self._n_queries
+        self._n_queries += 1
+        centers = (
+            (self._search_a, self.query_times_a, self.wait_times_center_a),
+            (self._search_b, self.query_times_b, self.wait_times_center_b),
+            (self._search_c, self.query_times_c, self.wait_times_center_c),
+        )
+        search_done = [0.0] * 3
+        for k, (search_times, query_times, wait_times) in enumerate(centers):
+            sent = send_start + (k + 1) * OUTGOING_CHANNEL_TIME
+            start = max(sent, self._center_free[k])
+            wait_times[n] = start - sent
+            query_times[n] = search_times[i]
+            self._center_free[k] = search_done[k] = start + search_times[i]
+        return search_done
+    
+    def receive_response(self):
+        """Book the incoming channel for a response ready now (2 min)"""
+        start = max(self.env.now, self._incoming_free)
+        self._incoming_free = start + INCOMING_CHANNEL_TIME
+        return self._incoming_free
+    
+    def record_uncontended(self, request_id, preprocess_done, search_done, received):
+        """Record the statistics of a request served by the fast path"""
+        i = request_id - 1
+        self.preprocess_times[self._n_pre] = self._preprocess[i]
+        self._n_pre += 1
+        
+        # No waiting at any center
+        n = self._n_queries
+        self._n_queries += 1
+        self.wait_times_center_a[n] = 0.0
+        self.wait_times_center_b[n] = 0.0
+        self.wait_times_center_c[n] = 0.0
+        self.query_times_a[n] = self._search_a[i]
+        self.query_times_b[n] = self._search_b[i]
+        self.query_times_c[n] = self._search_c[i]
+        
+        if self._trace:
+            self.events.append((preprocess_done, EVT_PREPROCESSED, request_id,
+                                self._preprocess[i]))
+            for center, done, back in zip('ABC', search_done, received):
+                self.events.append((done, EVT_SEARCH_DONE, request_id, center))
+                self.events.append((back, EVT_RESPONSE_RECEIVED, request_id, center))
+    
+    def complete_request(self, request_id, arrival_time, query_start):
+        """Bookkeeping once all three responses of a request are back"""
         query_time = self.env.now - query_start
-        print(f"[{self.env.now:.2f}] Request {request_id} all center responses received "
-              f"(query phase took {query_time:.2f} min)")
+        if self._trace:
+            self.events.append((self.env.now, EVT_ALL_RESPONSES, request_id,
+                                query_time))
         
         # Request is complete
         total_time = self.env.now - arrival_time
-        self.total_times.append(total_time)
+        self.total_times[self.requests_completed] = total_time
         self.requests_completed += 1
+        self._in_flight -= 1
         
-        print(f"[{self.env.now:.2f}] Request {request_id} COMPLETED "
-              f"(total time: {total_time:.2f} min)")
-    
-    def query_center_a(self, request_id):
-        """Query center A: transmit (1 min), search (5±2 min), receive (2 min)"""
-        # Transmit request to center A
-        with self.outgoing_channel.request() as req:
-            yield req
-            yield self.env.timeout(OUTGOING_CHANNEL_TIME)
-        
-        # Search at center A
-        queue_start = self.env.now
-        with self.center_a.request() as req:
-            yield req
-            wait_time = self.env.now - queue_start
-            self.wait_times_center_a.append(wait_time)
-            
-            search_time = random.uniform(CENTER_A_MIN, CENTER_A_MAX)
-            yield self.env.timeout(search_time)
-            self.query_times_a.append(search_time)
-        
-        print(f"[{self.env.now:.2f}] Request {request_id} Center A search complete")
-        
-        # Receive response from center A
-        with self.incoming_channel.request() as req:
-            yield req
-            yield self.env.timeout(INCOMING_CHANNEL_TIME)
-        
-        print(f"[{self.env.now:.2f}] Request {request_id} Center A response received")
-    
-    def query_center_b(self, request_id):
-        """Query center B: transmit (1 min), search (10±5 min), receive (2 min)"""
-        # Transmit request to center B
-        with self.outgoing_channel.request() as req:
-            yield req
-            yield self.env.timeout(OUTGOING_CHANNEL_TIME)
-        
-        # Search at center B
-        queue_start = self.env.now
-        with self.center_b.request() as req:
-            yield req
-            wait_time = self.env.now - queue_start
-            self.wait_times_center_b.append(wait_time)
-            
-            search_time = random.uniform(CENTER_B_MIN, CENTER_B_MAX)
-            yield self.env.timeout(search_time)
-            self.query_times_b.append(search_time)
-        
-        print(f"[{self.env.now:.2f}] Request {request_id} Center B search complete")
-        
-        # Receive response from center B
-        with self.incoming_channel.request() as req:
-            yield req
-            yield self.env.timeout(INCOMING_CHANNEL_TIME)
-        
-        print(f"[{self.env.now:.2f}] Request {request_id} Center B response received")
-    
-    def query_center_c(self, request_id):
-        """Query center C: transmit (1 min), search (8±4 min), receive (2 min)"""
-        # Transmit request to center C
-        with self.outgoing_channel.request() as req:
-            yield req
-            yield self.env.timeout(OUTGOING_CHANNEL_TIME)
-        
-        # Search at center C
-        queue_start = self.env.now
-        with self.center_c.request() as req:
-            yield req
-            wait_time = self.env.now - queue_start
-            self.wait_times_center_c.append(wait_time)
-            
-            search_time = random.uniform(CENTER_C_MIN, CENTER_C_MAX)
-            yield self.env.timeout(search_time)
-            self.query_times_c.append(search_time)
-        
-        print(f"[{self.env.now:.2f}] Request {request_id} Center C search complete")
-        
-        # Receive response from center C
-        with self.incoming_channel.request() as req:
-            yield req
-            yield self.env.timeout(INCOMING_CHANNEL_TIME)
-        
-        print(f"[{self.env.now:.2f}] Request {request_id} Center C response received")
+        if self._trace:
+            self.events.append((self.env.now, EVT_COMPLETED, request_id,
+                                total_time))
+    
+    def finalize(self):
+        """Trim the statistics arrays to the samples actually recorded"""
+        self.total_times = self.total_times[:self.requests_completed]
+        self.preprocess_times = self.preprocess_times[:self._n_pre]
+        self.query_times_a = self.query_times_a[:self._n_queries]
+        self.query_times_b = self.query_times_b[:self._n_queries]
+        self.query_times_c = self.query_times_c[:self._n_queries]
+        self.wait_times_center_a = self.wait_times_center_a[:self._n_queries]
+        self.wait_times_center_b = self.wait_times_center_b[:self._n_queries]
+        self.wait_times_center_c = self.wait_times_center_c[:self._n_queries]
+
+
+def log_events(events):
+    """Log the recorded event trace, in time order"""
+    for time, code, *values in sorted(events, key=lambda event: event[0]):
+        log.debug("[%.2f] " + EVENT_FORMATS[code], time, *values)
 
 
 def run_simulation():
     """Run the distributed database system simulation"""
+    # Trace level from the environment, e.g. SIM_LOG_LEVEL=DEBUG
+    logging.basicConfig(level=os.environ.get("SIM_LOG_LEVEL", "WARNING").upper(),
+                        format="%(message)s", stream=sys.stdout)
+    
     print("=" * 70)
     print("TOPIC 28: DISTRIBUTED DATABASE SYSTEM SIMULATION")
     print("=" * 70)
@@ -220,9 +334,12 @@ def run_simulation():
     # Start request generation
     env.process(system.request_generator())
     
-    # Run until all requests are completed
-    while system.requests_completed < NUM_REQUESTS:
-        env.step()
+    # The source stops after the last arrival, so the event queue drains
+    # once every request has completed
+    env.run()
+    system.finalize()
+    
+    log_events(system.events)
     
     # Print results
     print("\n" + "=" * 70)
@@ -232,31 +349,32 @@ def run_simulation():
     print(f"\nRequest Statistics:")
     print(f"  Requests generated: {system.requests_generated}")
     print(f"  Requests completed: {system.requests_completed}")
+    print(f"  Served without contention: {system.requests_uncontended}")
     
     print(f"\nTotal Time Statistics:")
-    if system.total_times:
+    if len(system.total_times):
         print(f"  Average: {np.mean(system.total_times):.2f} min")
         print(f"  Minimum: {np.min(system.total_times):.2f} min")
         print(f"  Maximum: {np.max(system.total_times):.2f} min")
     
     print(f"\nPreprocessing Time:")
-    if system.preprocess_times:
+    if len(system.preprocess_times):
         print(f"  Average: {np.mean(system.preprocess_times):.2f} min")
     
     print(f"\nCenter A (fastest, 5±2 min):")
-    if system.query_times_a:
+    if len(system.query_times_a):
         print(f"  Queries: {len(system.query_times_a)}")
         print(f"  Avg search time: {np.mean(system.query_times_a):.2f} min")
         print(f"  Avg wait time: {np.mean(system.wait_times_center_a):.2f} min")
     
     print(f"\nCenter B (slowest, 10±5 min):")
-    if system.query_times_b:
+    if len(system.query_times_b):
         print(f"  Queries: {len(system.query_times_b)}")
         print(f"  Avg search time: {np.mean(system.query_times_b):.2f} min")
         print(f"  Avg wait time: {np.mean(system.wait_times_center_b):.2f} min")
     
     print(f"\nCenter C (medium, 8±4 min):")
-    if system.query_times_c:
+    if len(system.query_times_c):
         print(f"  Queries: {len(system.query_times_c)}")
         print(f"  Avg search time: {np.mean(system.query_times_c):.2f} min")
         print(f"  Avg wait time: {np.mean(system.wait_times_center_c):.2f} min")
@@ -280,7 +398,7 @@ def run_simulation():
         f.write("=" * 50 + "\n")
         f.write(f"Requests generated: {system.requests_generated}\n")
         f.write(f"Requests completed: {system.requests_completed}\n")
-        if system.total_times:
+        if len(system.total_times):
             f.write(f"Avg total time: {np.mean(system.total_times):.2f} min\n")
             f.write(f"Min total time: {np.min(system.total_times):.2f} min\n")
             f.write(f"Max total time: {np.max(system.total_times):.2f} min\n")
@@ -288,6 +406,102 @@ def run_simulation():
     return system
 
 
+def _fifo_departures(arrive, service):
+    """Departure times from a single FIFO server, one row per replication.
+    
+    Lindley's recursion d[i] = max(a[i], d[i-1]) + s[i] unrolls to
+    d[i] = S[i] + max(a[j] - S[j-1] for j <= i) with S the running sum of
+    service times, so it becomes a cumulative max along each row.
+    """
+    served = np.cumsum(service, axis=-1)
+    return served + np.maximum.accumulate(arrive - (served - service), axis=-1)
+
+
+def run_batch(seeds):
+    """Run one independent replication per seed, all at once as 2-D arrays"""
+    n = NUM_REQUESTS
+    draws = [draw_samples(seed, n) for seed in seeds]
+    # Shape (5, replications, requests)
+    interarrival, preprocess, *search = np.array(draws).transpose(1, 0, 2)
+    
+    arrivals = np.cumsum(interarrival, axis=1)
+    preprocess_done = _fifo_departures(arrivals, preprocess)
+    
+    # The three queries of a request take the outgoing channel back to back
+    batch_time = np.full_like(arrivals, 3 * OUTGOING_CHANNEL_TIME)
+    send_start = _fifo_departures(preprocess_done, batch_time) - batch_time
+    
+    search_done = []
+    wait_times = []
+    for k, search_time in enumerate(search):
+        sent = send_start + (k + 1) * OUTGOING_CHANNEL_TIME
+        done = _fifo_departures(sent, search_time)
+        search_done.append(done)
+        wait_times.append(done - search_time - sent)
+    
+    # Responses take the incoming channel in the order the searches finish
+    ready = np.concatenate(search_done, axis=1)
+    order = np.argsort(ready, axis=1, kind='stable')
+    received = np.empty_like(ready)
+    np.put_along_axis(received, order, _fifo_departures(
+        np.take_along_axis(ready, order, axis=1),
+        np.full_like(ready, INCOMING_CHANNEL_TIME)), axis=1)
+    completed = received.reshape(len(seeds), 3, n).max(axis=1)
+    
+    return {
+        'total_times': completed - arrivals,
+        'preprocess_times': preprocess,
+        'wait_times_center_a': wait_times[0],
+        'wait_times_center_b': wait_times[1],
+        'wait_times_center_c': wait_times[2],
+    }
+
+
+def run_many(n_reps):
+    """Split replications into batches and run the batches in parallel"""
+    seeds = range(SEED, SEED + n_reps)
+    batches = [seeds[i:i + BATCH_SIZE] for i in range(0, n_reps, BATCH_SIZE)]
+    if len(batches) == 1:
+        return run_batch(seeds)
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        parts = list(executor.map(run_batch, batches))
+    return {key: np.concatenate([part[key] for part in parts])
+            for key in parts[0]}
+
+
+def report_batch(results):
+    """Print statistics across replications"""
+    total_times = results['total_times']
+    replications = len(total_times)
+    means = total_times.mean(axis=1)
+    
+    print("=" * 70)
+    print("TOPIC 28: DISTRIBUTED DATABASE SYSTEM - BATCH OF REPLICATIONS")
+    print("=" * 70)
+    print(f"Replications: {replications} x {NUM_REQUESTS} requests")
+    
+    print(f"\nTotal Time Statistics:")
+    print(f"  Average: {np.mean(total_times):.2f} min")
+    if replications > 1:
+        half_width = 1.96 * means.std(ddof=1) / np.sqrt(replications)
+        print(f"  95% CI of the mean: {means.mean():.2f} +/- {half_width:.2f} min")
+    print(f"  Minimum: {np.min(total_times):.2f} min")
+    print(f"  Maximum: {np.max(total_times):.2f} min")
+    
+    print(f"\nAverage wait time at centers:")
+    print(f"  Center A: {np.mean(results['wait_times_center_a']):.2f} min")
+    print(f"  Center B: {np.mean(results['wait_times_center_b']):.2f} min")
+    print(f"  Center C: {np.mean(results['wait_times_center_c']):.2f} min")
+
+
 if __name__ == "__main__":
-    random.seed(42)
-    run_simulation()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--replications", type=int, default=0,
+                        help="run this many vectorized replications instead of one SimPy run")
+    args = parser.parse_args()
+    
+    if args.replications > 0:
+        report_batch(run_many(args.replications))
+    else:
+        run_simulation()
@@ -1,8 +1,18 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import simpy
-import random
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, the sweep then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # Configuration
+SEED = 42
 SIMULATION_TIME = 0
 MAX_MESSAGES = 250  # Simulation ends after 250 messages
 
@@ -34,87 +44,150 @@ DEADLINE = 12.0 # Max wait time in buffer.
 # "Dynamic of process is such that it makes sense to process messages that wait no more than 12s in buffer."
 # "The rest are considered lost."
 
-class Monitor:
+class Server:
+    # Single server; the buffer is FIFO, so the time it is next free is
+    # all that decides when a message starts
     def __init__(self):
-        self.generated_count = 0
-        self.processed_count = 0
-        self.lost_count = 0
-        self.wait_times = []
-        
-monitor = Monitor()
+        self.free = 0.0
+        self.last_drop = 0.0  # When the last lost message left the buffer
 
-def process_message(env, name, server):
-    arrival_time = env.now
-    
-    # Message enters buffer
-    # It waits for server. 
-    # But we need to check if it waits too long.
-    # SimPy Resource request: we can't easily check "time in queue" before getting resource unless we use Reneging.
-    
-    with server.request() as req:
-        # We wait for the server OR until deadline is reached relative to arrival?
-        # The constraint is: "wait no more than 12s in buffer".
-        # So if (now - arrival) > 12 when we *would* start processing, we drop it?
-        # Or do we drop it exactly at arrival+12 if not started?
-        # Usually "reneging" means leaving queue at strict time.
-        
-        results = yield req | env.timeout(DEADLINE)
-        
-        if req in results:
-            # We got the server
-            wait_time = env.now - arrival_time
-            # Double check constraint just in case (though timeout handles it)
-            if wait_time > DEADLINE:
-                # This path shouldn't theoretically be reached if timeout works, 
-                # but with | operator, if both happen same tick... 
-                monitor.lost_count += 1
-            else:
-                monitor.wait_times.append(wait_time)
-                # Process
-                proc_time = random.uniform(PROCESS_MIN, PROCESS_MAX)
-                yield env.timeout(proc_time)
-                monitor.processed_count += 1
-        else:
-            # Timed out (waited > 12s)
-            monitor.lost_count += 1
-            # We don't process it.
+def draw_samples(seed=SEED, n=MAX_MESSAGES):
+    # Every random value of a run, drawn up front in one block per
+    # distribution; both models use it, so a seed gives the same messages
+    rng = np.random.default_rng(seed)
+    interarrivals = rng.uniform(ARRIVAL_MIN, ARRIVAL_MAX, n)
+    proc_times = rng.uniform(PROCESS_MIN, PROCESS_MAX, n)
+    return interarrivals, proc_times
+
+# Message counters, kept in one int64 array so the state is plain NumPy
+GENERATED = 0
+PROCESSED = 1
+LOST = 2
 
-def source(env, server):
-    i = 0
-    while monitor.generated_count < MAX_MESSAGES:
+def source(env, server, interarrivals, proc_times, counters, wait_times):
+    # The buffer is FIFO in front of a single server, so whether a message
+    # is served or lost is known the moment it arrives: it would start once
+    # the server is free, and it is lost if that is more than 12s away.
+    # No SimPy process is spawned per message.
+    timeout = env.timeout
+    for i in range(MAX_MESSAGES):
         # Inter-arrival
-        dt = random.uniform(ARRIVAL_MIN, ARRIVAL_MAX)
-        yield env.timeout(dt)
+        yield timeout(interarrivals[i])
+        counters[GENERATED] += 1
         
-        i += 1
-        monitor.generated_count += 1
-        env.process(process_message(env, f'Msg-{i}', server))
+        now = env.now
+        start = max(now, server.free)
+        if start - now > DEADLINE:
+            # Dropped from the buffer when its deadline passes
+            counters[LOST] += 1
+            server.last_drop = now + DEADLINE
+        else:
+            # Booked now, so the next message queues behind this one
+            server.free = start + proc_times[i]
+            wait_times[counters[PROCESSED]] = start - now
+            counters[PROCESSED] += 1
 
-def main():
-    env = simpy.Environment()
-    server = simpy.Resource(env, capacity=1)
+@njit(cache=True, fastmath=True)
+def _sweep(arrivals, proc_times, deadline):
+    # The buffer is FIFO in front of a single server, so a message starts
+    # at max(arrival, server free). If that start is more than `deadline`
+    # after its arrival it reneges and never occupies the server.
+    n = arrivals.shape[0]
+    counters = np.zeros(3, dtype=np.int64)
+    wait_times = np.empty(n)
+    free = 0.0
+    dropped = 0.0
+    for i in range(n):
+        counters[GENERATED] += 1
+        start = max(arrivals[i], free)
+        if start - arrivals[i] > deadline:
+            counters[LOST] += 1
+            dropped = arrivals[i] + deadline
+        else:
+            wait_times[counters[PROCESSED]] = start - arrivals[i]
+            counters[PROCESSED] += 1
+            free = start + proc_times[i]
+    # The run ends with the last completion or the last drop
+    end = max(free, dropped)
+    return counters, wait_times[:counters[PROCESSED]], end
+
+def simulate_fast(seed=SEED):
+    # Same model as main(), computed over pre-sampled arrays; prints nothing
+    interarrivals, proc_times = draw_samples(seed)
+    return _sweep(interarrivals.cumsum(), proc_times, DEADLINE)
+
+def run_fast(seed=SEED):
+    report(*simulate_fast(seed))
+
+def run_many(n_reps):
+    # Independent replications in parallel, one seed each
+    seeds = range(SEED, SEED + n_reps)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(simulate_fast, seeds))
+    
+    counters = np.array([c for c, _, _ in results])
+    wait_times = np.concatenate([w for _, w, _ in results])
+    loss_rates = counters[:, LOST] / counters[:, GENERATED]
+    generated, processed, lost = counters.sum(axis=0)
     
-    env.process(source(env, server))
+    print(f"Topic 31 Results over {n_reps} replications (seeds {SEED}..{SEED + n_reps - 1}):")
+    print(f"  Messages Generated: {generated}")
+    print(f"  Messages Processed: {processed}")
+    print(f"  Messages Lost (Timeout > 12s): {lost}")
+    print(f"  Loss Rate: {loss_rates.mean() * 100:.2f}%")
+    if n_reps > 1:
+        half_width = 1.96 * loss_rates.std(ddof=1) / np.sqrt(n_reps)
+        print(f"  95% CI of the Loss Rate: +/- {half_width * 100:.2f}%")
+    if len(wait_times):
+        print(f"  Avg Wait Time (Processed): {np.mean(wait_times):.4f} s")
+        print(f"  Max Wait Time (Processed): {np.max(wait_times):.4f} s")
+    return results
+
+def main(seed=SEED):
+    interarrivals, proc_times = draw_samples(seed)
+    
+    env = simpy.Environment()
+    server = Server()
+    counters = np.zeros(3, dtype=np.int64)
+    # Preallocated; the first counters[PROCESSED] entries are filled
+    wait_times = np.empty(MAX_MESSAGES)
     
-    # Run until we generate 250 messages and they clear out (or enough time passes)
-    # We can just run for a long time, the source stops at 250.
-    env.run() 
+    env.process(source(env, server, interarrivals, proc_times,
+                       counters, wait_times))
     
-    print(f"Simulation ended at {env.now:.2f}s")
+    # The source stops at 250 messages; the run then lasts until the last
+    # message is processed or dropped
+    env.run()
+    report(counters, wait_times[:counters[PROCESSED]],
+           max(server.free, server.last_drop))
+
+def report(counters, wait_times, end_time):
+    generated, processed, lost = counters
+    print(f"Simulation ended at {end_time:.2f}s")
     print("-" * 30)
     print("Topic 31 Results:")
-    print(f"  Messages Generated: {monitor.generated_count}")
-    print(f"  Messages Processed: {monitor.processed_count}")
-    print(f"  Messages Lost (Timeout > 12s): {monitor.lost_count}")
-    print(f"  Loss Rate: {monitor.lost_count / monitor.generated_count * 100:.2f}%")
-    if monitor.wait_times:
-        print(f"  Avg Wait Time (Processed): {np.mean(monitor.wait_times):.4f} s")
-        print(f"  Max Wait Time (Processed): {np.max(monitor.wait_times):.4f} s")
+    print(f"  Messages Generated: {generated}")
+    print(f"  Messages Processed: {processed}")
+    print(f"  Messages Lost (Timeout > 12s): {lost}")
+    print(f"  Loss Rate: {lost / generated * 100:.2f}%")
+    if len(wait_times):
+        print(f"  Avg Wait Time (Processed): {np.mean(wait_times):.4f} s")
+        print(f"  Max Wait Time (Processed): {np.max(wait_times):.4f} s")
 
     # Save data for TikZ
-    with open('topic31_wait_times.txt', 'w') as f:
-        for t in monitor.wait_times:
-            f.write(f"{t}\n")
+    np.savetxt('topic31_wait_times.txt', wait_times, fmt='%.6f')
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Topic 31 simulation")
+    parser.add_argument("--legacy", action="store_true",
+                        help="run the original SimPy model instead of the NumPy sweep")
+    parser.add_argument("--replications", type=int, default=0,
+                        help="run this many NumPy replications in parallel")
+    args = parser.parse_args()
+    
+    if args.replications > 0:
+        run_many(args.replications)
+    elif args.legacy:
+        main()
+    else:
+        run_fast()
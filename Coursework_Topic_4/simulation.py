@@ -3,18 +3,119 @@ Topic 4: Email Processing System Simulation
 Complex system with 3 message types and parallel processing workflows.
 """
 
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import simpy
-import random
 import numpy as np
 
 # Constants
+SEED = 42
 SIMULATION_HOURS = 100
 SIMULATION_TIME = SIMULATION_HOURS * 60  # 100 hours in minutes
 ARRIVAL_MEAN = 20
 ARRIVAL_VAR = 5
+ARRIVAL_MIN = ARRIVAL_MEAN - ARRIVAL_VAR
+ARRIVAL_MAX = ARRIVAL_MEAN + ARRIVAL_VAR
+
+# Response assembly: client 60 ± 2 min, other two 60 ± 8 min
+CLIENT_MIN = 60 - 2
+CLIENT_MAX = 60 + 2
+OTHER_MIN = 60 - 8
+OTHER_MAX = 60 + 8
+
+# Upper bound on the number of arrivals within the simulated time
+MAX_EMAILS = int(SIMULATION_TIME // ARRIVAL_MIN) + 1
+
+# Event trace, logged at DEBUG level after the run.
+# Enable it with SIM_LOG_LEVEL=DEBUG; below that nothing is recorded.
+log = logging.getLogger(__name__)
+
+EVT_SIMPLE_DONE = 0
+EVT_SPAM_DELETED = 1
+EVT_PREPROCESSED = 2
+EVT_SUPPLIER_CONFIRMED = 3
+EVT_WAREHOUSE_CONFIRMED = 4
+EVT_CONFIRMED = 5
+EVT_CLIENT_ASSEMBLED = 6
+EVT_OTHER_ASSEMBLED = 7
+EVT_COMPLETED = 8
+
+EVENT_FORMATS = {
+    EVT_SIMPLE_DONE: "Simple email %d processed and response sent",
+    EVT_SPAM_DELETED: "Spam email %d deleted",
+    EVT_PREPROCESSED: "Email %d preprocessing complete, requesting confirmations...",
+    EVT_SUPPLIER_CONFIRMED: "Email %d supplier confirmation received",
+    EVT_WAREHOUSE_CONFIRMED: "Email %d warehouse confirmation received",
+    EVT_CONFIRMED: "Email %d all confirmations received, assembling response...",
+    EVT_CLIENT_ASSEMBLED: "Email %d client response assembled",
+    EVT_OTHER_ASSEMBLED: "Email %d other responses assembled",
+    EVT_COMPLETED: "Email %d COMPLETED. Total time: %.2f min",
+}
+
+class RunningStats:
+    """Count, sum, min and max of a sample, updated as each value arrives"""
+    __slots__ = ('n', 'total', 'min', 'max')
+    
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+    
+    def add(self, value):
+        self.n += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other):
+        """Fold the statistics of another sample into this one"""
+        self.n += other.n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    @classmethod
+    def of(cls, values):
+        """Statistics of a whole NumPy array"""
+        stats = cls()
+        if len(values):
+            stats.n = len(values)
+            stats.total = float(values.sum())
+            stats.min = float(values.min())
+            stats.max = float(values.max())
+        return stats
+    
+    @property
+    def mean(self):
+        return self.total / self.n
+
+
+def draw_samples(seed=SEED, n=MAX_EMAILS):
+    """Draw every random value of a run up front, one block per distribution.
+    
+    Both models take their samples from here, so a seed gives the same emails
+    in the SimPy model and in the NumPy computation. Returns the arrival
+    times, the email types (1 = simple, 2 = spam, 3 = complex) and the client
+    and other response assembly times.
+    """
+    rng = np.random.default_rng(seed)
+    arrivals = rng.uniform(ARRIVAL_MIN, ARRIVAL_MAX, n).cumsum()
+    email_types = rng.integers(1, 4, n)
+    client = rng.uniform(CLIENT_MIN, CLIENT_MAX, n)
+    other = rng.uniform(OTHER_MIN, OTHER_MAX, n)
+    return arrivals, email_types, client, other
+
 
 class EmailSystem:
-    def __init__(self, env):
+    def __init__(self, env, seed=SEED):
         self.env = env
         self.total_emails = 0
         self.simple_processed = 0
@@ -22,121 +123,199 @@ class EmailSystem:
         self.complex_processed = 0
         self.completed_orders = 0
         
-        # Statistics
-        self.simple_times = []
-        self.spam_times = []
-        self.complex_total_times = []
+        # Statistics, accumulated without keeping every sample
+        self.simple_times = RunningStats()
+        self.spam_times = RunningStats()
+        self.complex_total_times = RunningStats()
+        
+        # (time, event code, email id, *values) records when tracing
+        self._trace = log.isEnabledFor(logging.DEBUG)
+        self.events = []
+        
+        # Random values drawn up front, indexed by email
+        arrivals, email_types, self._client, self._other = draw_samples(seed)
+        # Only the emails that arrive within the simulated time
+        arrived = arrivals < SIMULATION_TIME
+        self._arrivals = arrivals[arrived].tolist()
+        self._email_types = email_types[arrived].tolist()
         
     def email_arrival(self):
-        """Generate emails according to uniform distribution"""
-        while True:
-            interarrival = random.uniform(ARRIVAL_MEAN - ARRIVAL_VAR, ARRIVAL_MEAN + ARRIVAL_VAR)
-            yield self.env.timeout(interarrival)
+        """Release the pre-drawn emails at their arrival times"""
+        env = self.env
+        timeout = env.timeout
+        process = env.process
+        for arrival, email_type in zip(self._arrivals, self._email_types):
+            # Only the next arrival is ever on the event queue
+            yield timeout(arrival - env.now)
             
             self.total_emails += 1
             email_id = self.total_emails
             
-            # Determine email type (1/3 each)
-            email_type = random.randint(1, 3)
-            
+            # Email type (1/3 each) was drawn with the arrival
             if email_type == 1:
                 # Simple email - processed in 60 min
-                self.env.process(self.process_simple_email(email_id))
+                process(self.process_simple_email(email_id))
             elif email_type == 2:
                 # Spam - deleted in 1 min
-                self.env.process(self.process_spam(email_id))
+                process(self.process_spam(email_id))
             else:
                 # Complex email - requires preprocessing and parallel assembly
-                self.env.process(self.process_complex_email(email_id))
+                process(self.process_complex_email(email_id))
     
     def process_simple_email(self, email_id):
         """Type 1: Simple processing within 60 minutes"""
-        start_time = self.env.now
+        env = self.env
+        start_time = env.now
         processing_time = 60
-        yield self.env.timeout(processing_time)
+        yield env.timeout(processing_time)
         
+        now = env.now
         self.simple_processed += 1
-        self.simple_times.append(self.env.now - start_time)
-        print(f"[{self.env.now:.2f}] Simple email {email_id} processed and response sent")
+        self.simple_times.add(now - start_time)
+        if self._trace:
+            self.events.append((now, EVT_SIMPLE_DONE, email_id))
     
     def process_spam(self, email_id):
         """Type 2: Spam deleted within 1 minute"""
-        start_time = self.env.now
-        yield self.env.timeout(1)
+        env = self.env
+        start_time = env.now
+        yield env.timeout(1)
         
+        now = env.now
         self.spam_deleted += 1
-        self.spam_times.append(self.env.now - start_time)
-        print(f"[{self.env.now:.2f}] Spam email {email_id} deleted")
+        self.spam_times.add(now - start_time)
+        if self._trace:
+            self.events.append((now, EVT_SPAM_DELETED, email_id))
     
     def process_complex_email(self, email_id):
         """Type 3: Complex email with preprocessing and parallel assembly"""
-        start_time = self.env.now
+        env = self.env
+        start_time = env.now
         
         # Preprocessing: 30 minutes
-        yield self.env.timeout(30)
-        print(f"[{self.env.now:.2f}] Email {email_id} preprocessing complete, requesting confirmations...")
+        yield env.timeout(30)
         
-        # Wait for two confirmation messages (from supplier and warehouse)
-        # These arrive and are processed in parallel
-        confirmation_results = yield simpy.AllOf(self.env, [
-            self.env.process(self.get_supplier_confirmation(email_id)),
-            self.env.process(self.get_warehouse_confirmation(email_id))
-        ])
-        
-        print(f"[{self.env.now:.2f}] Email {email_id} all confirmations received, assembling response...")
+        # Confirmations from supplier and warehouse arrive immediately after
+        # preprocessing, so they take no simulated time and need no process
+        if self._trace:
+            now = env.now
+            self.events.append((now, EVT_PREPROCESSED, email_id))
+            self.events.append((now, EVT_SUPPLIER_CONFIRMED, email_id))
+            self.events.append((now, EVT_WAREHOUSE_CONFIRMED, email_id))
+            self.events.append((now, EVT_CONFIRMED, email_id))
         
         # Parallel assembly: client response (60±2 min) and other two (60±8 min)
-        yield simpy.AllOf(self.env, [
-            self.env.process(self.assemble_client_response(email_id)),
-            self.env.process(self.assemble_other_responses(email_id))
+        process = env.process
+        yield simpy.AllOf(env, [
+            process(self.assemble_client_response(email_id)),
+            process(self.assemble_other_responses(email_id))
         ])
         
+        now = env.now
         self.complex_processed += 1
-        total_time = self.env.now - start_time
-        self.complex_total_times.append(total_time)
+        total_time = now - start_time
+        self.complex_total_times.add(total_time)
         self.completed_orders += 1
-        print(f"[{self.env.now:.2f}] Email {email_id} COMPLETED. Total time: {total_time:.2f} min")
-    
-    def get_supplier_confirmation(self, email_id):
-        """Get confirmation from supplier"""
-        # This is part of the parallel confirmation collection
-        yield self.env.timeout(0)  # Arrives immediately after preprocessing
-        print(f"[{self.env.now:.2f}] Email {email_id} supplier confirmation received")
-    
-    def get_warehouse_confirmation(self, email_id):
-        """Get confirmation from warehouse"""
-        # This is part of the parallel confirmation collection
-        yield self.env.timeout(0)  # Arrives immediately after preprocessing
-        print(f"[{self.env.now:.2f}] Email {email_id} warehouse confirmation received")
+        if self._trace:
+            self.events.append((now, EVT_COMPLETED, email_id, total_time))
     
     def assemble_client_response(self, email_id):
         """Assemble client response: 60 ± 2 minutes"""
-        processing_time = random.uniform(60 - 2, 60 + 2)
-        yield self.env.timeout(processing_time)
-        print(f"[{self.env.now:.2f}] Email {email_id} client response assembled")
+        env = self.env
+        yield env.timeout(self._client[email_id - 1])
+        if self._trace:
+            self.events.append((env.now, EVT_CLIENT_ASSEMBLED, email_id))
     
     def assemble_other_responses(self, email_id):
         """Assemble other two responses: 60 ± 8 minutes (parallel)"""
-        processing_time = random.uniform(60 - 8, 60 + 8)
-        yield self.env.timeout(processing_time)
-        print(f"[{self.env.now:.2f}] Email {email_id} other responses assembled")
+        env = self.env
+        yield env.timeout(self._other[email_id - 1])
+        if self._trace:
+            self.events.append((env.now, EVT_OTHER_ASSEMBLED, email_id))
 
+def log_events(events):
+    """Log the recorded event trace"""
+    for time, code, *values in events:
+        log.debug("[%.2f] " + EVENT_FORMATS[code], time, *values)
 
-def run_simulation():
-    """Run the email processing simulation"""
-    print("=" * 60)
-    print("TOPIC 4: EMAIL PROCESSING SYSTEM SIMULATION")
-    print("=" * 60)
-    
+
+def simulate(seed=SEED):
+    """Run one seeded replication for 100 hours, without printing"""
     env = simpy.Environment()
-    system = EmailSystem(env)
+    system = EmailSystem(env, seed)
     
     # Start email arrival process
     env.process(system.email_arrival())
     
     # Run simulation for 100 hours
     env.run(until=SIMULATION_TIME)
+    return system
+
+
+def print_header():
+    """Print the title of a single run"""
+    print("=" * 60)
+    print("TOPIC 4: EMAIL PROCESSING SYSTEM SIMULATION")
+    print("=" * 60)
+
+
+def run_simulation(seed=SEED):
+    """Run the email processing simulation (SimPy model)"""
+    # Trace level from the environment, e.g. SIM_LOG_LEVEL=DEBUG
+    logging.basicConfig(level=os.environ.get("SIM_LOG_LEVEL", "WARNING").upper(),
+                        format="%(message)s", stream=sys.stdout)
+    
+    print_header()
+    system = simulate(seed)
+    log_events(system.events)
+    report_results(system)
+    return system
+
+
+class FastResults:
+    """Statistics of a vectorized run, with the same fields as EmailSystem"""
+
+
+def simulate_fast(seed=SEED):
+    """Compute a replication in closed form over pre-sampled NumPy arrays.
+    
+    Emails never wait for each other: there is no shared server and every
+    stage has its own duration, so each email's completion time follows
+    directly from its arrival time. An email counts as handled if it is done
+    before the end of the 100 hours. Nothing is printed.
+    """
+    arrivals, email_type, client, other = draw_samples(seed)
+    
+    arrived = arrivals < SIMULATION_TIME
+    simple = arrived & (email_type == 1) & (arrivals + 60 < SIMULATION_TIME)
+    spam = arrived & (email_type == 2) & (arrivals + 1 < SIMULATION_TIME)
+    # Preprocessing, then both assemblies in parallel
+    complex_times = 30 + np.maximum(client, other)
+    complex_done = (arrived & (email_type == 3) &
+                    (arrivals + complex_times < SIMULATION_TIME))
     
+    results = FastResults()
+    results.total_emails = int(np.count_nonzero(arrived))
+    results.simple_processed = int(np.count_nonzero(simple))
+    results.spam_deleted = int(np.count_nonzero(spam))
+    results.complex_processed = int(np.count_nonzero(complex_done))
+    results.completed_orders = results.complex_processed
+    results.simple_times = RunningStats.of(np.full(results.simple_processed, 60.0))
+    results.spam_times = RunningStats.of(np.full(results.spam_deleted, 1.0))
+    results.complex_total_times = RunningStats.of(complex_times[complex_done])
+    return results
+
+
+def run_fast(seed=SEED):
+    """Run the email system as a NumPy computation and report the results"""
+    print_header()
+    results = simulate_fast(seed)
+    report_results(results)
+    return results
+
+
+def report_results(system):
+    """Print and save statistics of a single run"""
     # Print results
     print("\n" + "=" * 60)
     print("SIMULATION RESULTS")
@@ -153,19 +332,19 @@ def run_simulation():
     expected_each = system.total_emails / 3
     print(f"\nExpected ~{expected_each:.0f} emails of each type")
     
-    if system.simple_times:
+    if system.simple_times.n:
         print(f"\nSimple Email Processing:")
-        print(f"  Average time: {np.mean(system.simple_times):.2f} min")
+        print(f"  Average time: {system.simple_times.mean:.2f} min")
     
-    if system.spam_times:
+    if system.spam_times.n:
         print(f"\nSpam Deletion:")
-        print(f"  Average time: {np.mean(system.spam_times):.2f} min")
+        print(f"  Average time: {system.spam_times.mean:.2f} min")
     
-    if system.complex_total_times:
+    if system.complex_total_times.n:
         print(f"\nComplex Email Processing:")
-        print(f"  Average total time: {np.mean(system.complex_total_times):.2f} min")
-        print(f"  Min time: {np.min(system.complex_total_times):.2f} min")
-        print(f"  Max time: {np.max(system.complex_total_times):.2f} min")
+        print(f"  Average total time: {system.complex_total_times.mean:.2f} min")
+        print(f"  Min time: {system.complex_total_times.min:.2f} min")
+        print(f"  Max time: {system.complex_total_times.max:.2f} min")
         # Expected: 30 + max(60±2, 60±8) ≈ 30 + 68 = 98 min minimum
     
     # Save results for LaTeX report
@@ -177,13 +356,56 @@ def run_simulation():
         f.write(f"Simple processed: {system.simple_processed}\n")
         f.write(f"Spam deleted: {system.spam_deleted}\n")
         f.write(f"Complex completed: {system.completed_orders}\n")
-        if system.complex_total_times:
-            f.write(f"Avg complex time: {np.mean(system.complex_total_times):.2f} min\n")
+        if system.complex_total_times.n:
+            f.write(f"Avg complex time: {system.complex_total_times.mean:.2f} min\n")
     
     print("\nResults saved to simulation_results.txt")
-    return system
+
+
+def run_many(n_reps):
+    """Run independent replications in parallel, one seed per replication"""
+    seeds = range(SEED, SEED + n_reps)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(simulate_fast, seeds))
+    
+    complex_times = RunningStats()
+    for r in results:
+        complex_times.merge(r.complex_total_times)
+    means = np.array([r.complex_total_times.mean for r in results])
+    
+    print("=" * 60)
+    print("TOPIC 4: EMAIL PROCESSING SYSTEM - REPLICATIONS")
+    print("=" * 60)
+    print(f"Replications: {n_reps} x {SIMULATION_HOURS} hours (seeds {SEED}..{SEED + n_reps - 1})")
+    print(f"\nEmail Statistics (average per replication):")
+    for key, label in [('total_emails', "Total emails received"),
+                       ('simple_processed', "Simple emails processed (Type 1)"),
+                       ('spam_deleted', "Spam deleted (Type 2)"),
+                       ('completed_orders', "Complex orders completed (Type 3)")]:
+        print(f"  {label}: {np.mean([getattr(r, key) for r in results]):.1f}")
+    
+    if complex_times.n:
+        print(f"\nComplex Email Processing:")
+        print(f"  Average total time: {complex_times.mean:.2f} min")
+        if n_reps > 1:
+            half_width = 1.96 * means.std(ddof=1) / np.sqrt(n_reps)
+            print(f"  95% CI of the mean: {means.mean():.2f} +/- {half_width:.2f} min")
+        print(f"  Min time: {complex_times.min:.2f} min")
+        print(f"  Max time: {complex_times.max:.2f} min")
+    return results
 
 
 if __name__ == "__main__":
-    random.seed(42)
-    run_simulation()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--legacy", action="store_true",
+                        help="run the original SimPy model instead of the NumPy computation")
+    parser.add_argument("--replications", type=int, default=0,
+                        help="run this many NumPy replications in parallel")
+    args = parser.parse_args()
+    
+    if args.replications > 0:
+        run_many(args.replications)
+    elif args.legacy:
+        run_simulation()
+    else:
+        run_fast()
@@ -0,0 +1,50 @@
+"""
+Minimal generator-based event loop, a drop-in for simpy.Environment in models
+that only use env.now, env.process and env.timeout.
+
+A timeout is just its delay: a process yields env.timeout(d) and is resumed d
+later. Pending resumptions are (time, priority, sequence, generator) tuples on
+a heapq. As in SimPy, starting a process is urgent and goes before timeouts
+due at the same time, and the sequence number keeps the rest in the order
+they were scheduled. There are no event objects, resources or return values.
+"""
+
+import heapq
+from itertools import count
+
+URGENT = 0
+NORMAL = 1
+
+
+class Environment:
+    def __init__(self):
+        self.now = 0.0
+        self._heap = []
+        self._sequence = count()
+
+    def timeout(self, delay):
+        """The value a process yields to wait for `delay`"""
+        return delay
+
+    def process(self, generator):
+        """Start `generator` as a process at the current time"""
+        heapq.heappush(self._heap, (self.now, URGENT, next(self._sequence), generator))
+        return generator
+
+    def run(self, until):
+        """Resume processes in time order until the simulated time `until`.
+
+        Like SimPy, nothing due at `until` itself is run.
+        """
+        heap = self._heap
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        sequence = self._sequence
+        while heap and heap[0][0] < until:
+            self.now, _, _, generator = heappop(heap)
+            try:
+                delay = next(generator)
+            except StopIteration:
+                continue
+            heappush(heap, (self.now + delay, NORMAL, next(sequence), generator))
+        self.now = until
@@ -1,8 +1,14 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import simpy
-import random
 import numpy as np
 
+import fast_env
+
 # Configuration
+SEED = 42
 SIMULATION_TIME = 1800  # 30 minutes in seconds
 
 # System 1 Parameters
@@ -16,66 +22,36 @@ ARRIVAL_DEV_2 = 1.0   # Max deviation. Assuming 3*sigma = 1 => sigma = 0.33
 PROCESS_MIN_2 = 1.0   # 2 - 1
 PROCESS_MAX_2 = 3.0   # 2 + 1
 
-class Monitor:
-    def __init__(self):
-        self.arrivals_1 = []
-        self.arrivals_2 = []
-        self.processed_1 = []
-        self.processed_2 = []
-        self.queue_times_1 = []
-        self.queue_times_2 = []
-        self.busy_time_1 = 0
-        self.busy_time_2 = 0
-
-monitor = Monitor()
-
-def process_request(env, name, server, process_min, process_max, monitor_queue, monitor_busy_ref):
-    arrival_time = env.now
-    
-    with server.request() as req:
-        yield req
-        
-        # Request enters service
-        wait_time = env.now - arrival_time
-        monitor_queue.append(wait_time)
-        
-        # Processing
-        proc_time = random.uniform(process_min, process_max)
-        monitor_busy_ref[0] += proc_time
-        
-        yield env.timeout(proc_time)
-        # Done
+# Deviates drawn per refill of a random stream
+RNG_BATCH = 10_000
 
-def source_1(env, server):
-    """Source for Computer 1: Exponential Inter-arrival"""
-    i = 0
+def deviates(draw, size=RNG_BATCH):
+    """Endless stream of draw(size) batches, handed out one float at a time"""
     while True:
-        # Inter-arrival
-        yield env.timeout(random.expovariate(1.0 / ARRIVAL_MEAN_1))
-        i += 1
-        monitor.arrivals_1.append(env.now)
-        env.process(process_request(env, f'Req1-{i}', server, PROCESS_MIN_1, PROCESS_MAX_1, monitor.queue_times_1, [monitor.busy_time_1]))
-        # Note: busy_time update with list ref is a bit hacky for simple vars, 
-        # but here we just need to track it. Actually, better to track busy time globally or in object.
-
-def source_2(env, server):
-    """Source for Computer 2: Normal Inter-arrival"""
-    i = 0
-    while True:
-        # Inter-arrival
-        # Normal distribution can be negative, need to clamp or retry. 
-        # With mean 3 and sigma 0.33, negative is very unlikely (9 sigma).
-        dt = random.gauss(ARRIVAL_MEAN_2, ARRIVAL_DEV_2 / 3.0)
-        if dt < 0: dt = 0
-        yield env.timeout(dt)
-        i += 1
-        monitor.arrivals_2.append(env.now)
-        env.process(process_request(env, f'Req2-{i}', server, PROCESS_MIN_2, PROCESS_MAX_2, monitor.queue_times_2, [monitor.busy_time_2]))
+        yield from draw(size).tolist()
 
 class ComputerSystem:
-    def __init__(self, env):
-        self.server1 = simpy.Resource(env, capacity=1)
-        self.server2 = simpy.Resource(env, capacity=1)
+    def __init__(self, env, seed=SEED):
+        # Random streams, drawn from NumPy in batches
+        self.rng = rng = np.random.default_rng(seed)
+        self._interarrivals_1 = deviates(lambda n: rng.exponential(ARRIVAL_MEAN_1, n))
+        self._proc_times_1 = deviates(lambda n: rng.uniform(PROCESS_MIN_1, PROCESS_MAX_1, n))
+        # Normal distribution can be negative, so it is clamped at 0.
+        # With mean 3 and sigma 0.33, negative is very unlikely (9 sigma).
+        self._interarrivals_2 = deviates(
+            lambda n: np.maximum(rng.normal(ARRIVAL_MEAN_2, ARRIVAL_DEV_2 / 3.0, n), 0.0))
+        self._proc_times_2 = deviates(lambda n: rng.uniform(PROCESS_MIN_2, PROCESS_MAX_2, n))
+        
+        # Time at which each server is next free. Both are FIFO single
+        # servers, so a scalar replaces the SimPy queue.
+        self.free1 = 0.0
+        self.free2 = 0.0
+        
+        # Statistics
+        self.queue_times_1 = []
+        self.queue_times_2 = []
+        self.processed_1 = []
+        self.processed_2 = []
         
         # Tracking busy time properly
         self.busy_t1 = 0.0
@@ -84,76 +60,124 @@ class ComputerSystem:
     def process_1(self, env):
         i = 0
         while True:
-            yield env.timeout(random.expovariate(1.0 / ARRIVAL_MEAN_1))
+            yield env.timeout(next(self._interarrivals_1))
             i += 1
             env.process(self.handle_req_1(env))
             
     def handle_req_1(self, env):
         arrival_time = env.now
-        with self.server1.request() as req:
-            yield req
-            wait = env.now - arrival_time
-            monitor.queue_times_1.append(wait)
-            
-            pt = random.uniform(PROCESS_MIN_1, PROCESS_MAX_1)
+        # Booked on arrival, so the next request queues behind this one
+        pt = next(self._proc_times_1)
+        wait = max(0.0, self.free1 - arrival_time)
+        self.free1 = arrival_time + wait + pt
+        if arrival_time + wait < SIMULATION_TIME:
+            # Counted once it enters service within the run
+            self.queue_times_1.append(wait)
             self.busy_t1 += pt
-            yield env.timeout(pt)
-            monitor.processed_1.append(env.now)
+        
+        yield env.timeout(wait + pt)
+        self.processed_1.append(env.now)
 
     def process_2(self, env):
         i = 0
         while True:
-            dt = random.gauss(ARRIVAL_MEAN_2, ARRIVAL_DEV_2 / 3.0)
-            if dt < 0: dt = 0
-            yield env.timeout(dt)
+            yield env.timeout(next(self._interarrivals_2))
             i += 1
             env.process(self.handle_req_2(env))
 
     def handle_req_2(self, env):
         arrival_time = env.now
-        with self.server2.request() as req:
-            yield req
-            wait = env.now - arrival_time
-            monitor.queue_times_2.append(wait)
-            
-            pt = random.uniform(PROCESS_MIN_2, PROCESS_MAX_2)
+        # Booked on arrival, so the next request queues behind this one
+        pt = next(self._proc_times_2)
+        wait = max(0.0, self.free2 - arrival_time)
+        self.free2 = arrival_time + wait + pt
+        if arrival_time + wait < SIMULATION_TIME:
+            # Counted once it enters service within the run
+            self.queue_times_2.append(wait)
             self.busy_t2 += pt
-            yield env.timeout(pt)
-            monitor.processed_2.append(env.now)
+        
+        yield env.timeout(wait + pt)
+        self.processed_2.append(env.now)
 
-def main():
-    env = simpy.Environment()
-    system = ComputerSystem(env)
+def simulate(seed=SEED, legacy=False):
+    # One seeded 30 minute run, nothing printed. The model only uses
+    # env.now, env.process and env.timeout, so it runs unchanged on the
+    # heapq loop of fast_env; legacy=True runs it on SimPy instead.
+    env = simpy.Environment() if legacy else fast_env.Environment()
+    system = ComputerSystem(env, seed)
     
     env.process(system.process_1(env))
     env.process(system.process_2(env))
     
     env.run(until=SIMULATION_TIME)
+    return system
+
+def main(seed=SEED, legacy=False):
+    system = simulate(seed, legacy)
     
     print(f"Simulation Time: {SIMULATION_TIME}s")
     print("-" * 30)
     print("Computer 1 (Exp Arrival, Uniform Process):")
-    print(f"  Requests Processed: {len(monitor.processed_1)}")
-    print(f"  Avg Wait Time: {np.mean(monitor.queue_times_1):.4f} s")
-    print(f"  Max Wait Time: {np.max(monitor.queue_times_1):.4f} s")
+    print(f"  Requests Processed: {len(system.processed_1)}")
+    print(f"  Avg Wait Time: {np.mean(system.queue_times_1):.4f} s")
+    print(f"  Max Wait Time: {np.max(system.queue_times_1):.4f} s")
     print(f"  Utilization: {system.busy_t1 / SIMULATION_TIME * 100:.2f}%")
     
     print("-" * 30)
     print("Computer 2 (Normal Arrival, Uniform Process):")
-    print(f"  Requests Processed: {len(monitor.processed_2)}")
-    print(f"  Avg Wait Time: {np.mean(monitor.queue_times_2):.4f} s")
-    print(f"  Max Wait Time: {np.max(monitor.queue_times_2):.4f} s")
+    print(f"  Requests Processed: {len(system.processed_2)}")
+    print(f"  Avg Wait Time: {np.mean(system.queue_times_2):.4f} s")
+    print(f"  Max Wait Time: {np.max(system.queue_times_2):.4f} s")
     print(f"  Utilization: {system.busy_t2 / SIMULATION_TIME * 100:.2f}%")
     
     # Generate data for TikZ
     # We will save wait times to a file to be plotted
-    with open('wait_times_1.txt', 'w') as f:
-        for t in monitor.queue_times_1:
-            f.write(f"{t}\n")
-            
-    with open('wait_times_2.txt', 'w') as f:
-        for t in monitor.queue_times_2:
-            f.write(f"{t}\n")
+    np.savetxt('wait_times_1.txt', np.fromiter(system.queue_times_1, np.float64), fmt='%.6f')
+    np.savetxt('wait_times_2.txt', np.fromiter(system.queue_times_2, np.float64), fmt='%.6f')
+
+def replicate(seed):
+    # Statistics of one run as plain values for the process pool
+    system = simulate(seed)
+    return {
+        'processed_1': len(system.processed_1),
+        'processed_2': len(system.processed_2),
+        'queue_times_1': np.array(system.queue_times_1),
+        'queue_times_2': np.array(system.queue_times_2),
+        'utilization_1': system.busy_t1 / SIMULATION_TIME,
+        'utilization_2': system.busy_t2 / SIMULATION_TIME,
+    }
+
+def run_many(n_reps):
+    # Independent replications in parallel, one seed each
+    seeds = range(SEED, SEED + n_reps)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(replicate, seeds))
+    
+    print(f"Replications: {n_reps} x {SIMULATION_TIME}s (seeds {SEED}..{SEED + n_reps - 1})")
+    for k, title in [(1, "Computer 1 (Exp Arrival, Uniform Process):"),
+                     (2, "Computer 2 (Normal Arrival, Uniform Process):")]:
+        waits = np.concatenate([r[f'queue_times_{k}'] for r in results])
+        means = np.array([np.mean(r[f'queue_times_{k}']) for r in results])
+        print("-" * 30)
+        print(title)
+        print(f"  Requests Processed (avg): {np.mean([r[f'processed_{k}'] for r in results]):.1f}")
+        print(f"  Avg Wait Time: {np.mean(waits):.4f} s")
+        if n_reps > 1:
+            half_width = 1.96 * means.std(ddof=1) / np.sqrt(n_reps)
+            print(f"  95% CI of the Avg Wait Time: +/- {half_width:.4f} s")
+        print(f"  Max Wait Time: {np.max(waits):.4f} s")
+        print(f"  Utilization: {np.mean([r[f'utilization_{k}'] for r in results]) * 100:.2f}%")
+    return results
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Topic 5 simulation")
+    parser.add_argument("--legacy", action="store_true",
+                        help="run on SimPy instead of the fast_env event loop")
+    parser.add_argument("--replications", type=int, default=0,
+                        help="run this many replications in parallel")
+    args = parser.parse_args()
+    
+    if args.replications > 0:
+        run_many(args.replications)
+    else:
+        main(legacy=args.legacy)
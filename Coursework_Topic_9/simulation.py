@@ -8,17 +8,25 @@ Complex system with:
 - Dual storage (main and backup)
 """
 
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import simpy
-import random
 import numpy as np
 
 # Constants
+SEED = 42
 SIMULATION_HOURS = 4
 SIMULATION_TIME = SIMULATION_HOURS * 3600  # 4 hours in seconds
 
 # Sensor A: arrives every (9 ± 4) seconds
 SENSOR_A_MEAN = 9
 SENSOR_A_VAR = 4
+SENSOR_A_MIN = SENSOR_A_MEAN - SENSOR_A_VAR
+SENSOR_A_MAX = SENSOR_A_MEAN + SENSOR_A_VAR
 
 # Sensor B: arrives every 2 seconds
 SENSOR_B_INTERVAL = 2
@@ -35,11 +43,115 @@ B_FOR_DISTRIBUTION = 3  # Need 3 type B messages
 # Storage time
 STORAGE_TIME = 0.5
 
+# Message types, as stored in DataCollectionSystem.msg_type
+TYPE_A = 0
+TYPE_B = 1
+TYPE_NAMES = "AB"
+
+# Upper bounds on the messages that can arrive within the simulated time
+MAX_A_MESSAGES = int(SIMULATION_TIME // SENSOR_A_MIN) + 1
+MAX_B_MESSAGES = int(SIMULATION_TIME // SENSOR_B_INTERVAL) + 1
+MAX_MESSAGES = MAX_A_MESSAGES + MAX_B_MESSAGES
+
+# Deviates drawn per refill of a random stream
+RNG_BATCH = 10_000
+
+# Event trace, logged at DEBUG level after the run.
+# Enable it with SIM_LOG_LEVEL=DEBUG; below that nothing is recorded.
+log = logging.getLogger(__name__)
+
+EVT_ARRIVED = 0
+EVT_PREPROCESS_START = 1
+EVT_PREPROCESS_FAILED = 2
+EVT_RETRY_DONE = 3
+EVT_PREPROCESSED = 4
+EVT_READY = 5
+EVT_BATCH_FORMING = 6
+EVT_STORED = 7
+EVT_BATCH_DONE = 8
+
+EVENT_FORMATS = {
+    EVT_ARRIVED: "Sensor %s arrived",
+    EVT_PREPROCESS_START: "Task starting preprocessing on %s",
+    EVT_PREPROCESS_FAILED: "Task FAILED on %s, retrying...",
+    EVT_RETRY_DONE: "Task RETRY completed on %s",
+    EVT_PREPROCESSED: "Task preprocessing complete on %s (time: %.2fs)",
+    EVT_READY: "Message %s ready for distribution",
+    EVT_BATCH_FORMING: "Distribution batch forming: 2A + 3B = %d messages",
+    EVT_STORED: "Message %s stored in dual storage",
+    EVT_BATCH_DONE: "Distribution batch complete: %d messages stored",
+}
+
+
+def deviates(draw, size=RNG_BATCH):
+    """Endless stream of draw(size) batches, handed out one float at a time"""
+    while True:
+        yield from draw(size).tolist()
+
+
+class RunningStats:
+    """Count, sum, min and max of a sample, updated as each value arrives"""
+    __slots__ = ('n', 'total', 'min', 'max')
+    
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+    
+    def add(self, value):
+        self.n += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other):
+        """Fold the statistics of another sample into this one"""
+        self.n += other.n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    @classmethod
+    def of(cls, values):
+        """Statistics of a whole NumPy array"""
+        stats = cls()
+        if len(values):
+            stats.n = len(values)
+            stats.total = float(values.sum())
+            stats.min = float(values.min())
+            stats.max = float(values.max())
+        return stats
+    
+    @property
+    def mean(self):
+        return self.total / self.n
+
 
 class DataCollectionSystem:
-    def __init__(self, env):
+    def __init__(self, env, seed=SEED):
         self.env = env
         
+        self.rng = rng = np.random.default_rng(seed)
+        # Arrival times of both sensors, known up front: sensor A's are
+        # drawn, sensor B's fall every 2 seconds. Merged into one table in
+        # time order, so a single process releases every message; only
+        # arrivals within the simulated time are kept.
+        arrivals_a = rng.uniform(SENSOR_A_MIN, SENSOR_A_MAX, MAX_A_MESSAGES).cumsum()
+        arrivals_b = SENSOR_B_INTERVAL * np.arange(1, MAX_B_MESSAGES + 1, dtype=np.float64)
+        arrivals = np.concatenate((arrivals_a, arrivals_b))
+        types = np.repeat(np.array([TYPE_A, TYPE_B], np.uint8),
+                          [MAX_A_MESSAGES, MAX_B_MESSAGES])
+        order = np.argsort(arrivals, kind='stable')
+        order = order[arrivals[order] < SIMULATION_TIME]
+        self._arrivals = arrivals[order].tolist()
+        self._arrival_types = types[order].tolist()
+        # Processor choice and failures, drawn from NumPy in batches
+        self._unit = deviates(rng.random)
+        
         # Resources
         self.processor1 = simpy.Resource(env, capacity=1)
         self.processor2 = simpy.Resource(env, capacity=1)
@@ -55,66 +167,79 @@ class DataCollectionSystem:
         self.tasks_retried = 0
         self.distributions_completed = 0
         
-        # Buffers for grouping and distribution
-        self.task_buffer = []  # For grouping 4 messages into tasks
-        self.preprocessed_a = []  # Successfully preprocessed A messages
-        self.preprocessed_b = []  # Successfully preprocessed B messages
+        # Messages as parallel arrays, indexed by order of arrival
+        self.msg_type = np.empty(MAX_MESSAGES, np.uint8)
+        self.msg_number = np.empty(MAX_MESSAGES, np.int64)  # per sensor type
+        self.msg_arrival = np.empty(MAX_MESSAGES, np.float64)
+        self.n_messages = 0
+        # Messages are grouped into tasks in arrival order, so the task
+        # buffer is the index range [n_grouped, n_messages)
+        self.n_grouped = 0
         
-        # Timing statistics
-        self.total_a_wait_times = []
-        self.total_b_wait_times = []
-        self.preprocess_times = []
+        # Preprocessed messages waiting for distribution, one FIFO queue of
+        # message indices per type, taken from at head and added to at tail
+        self.ready = np.empty((2, MAX_MESSAGES), np.int64)
+        self.ready_head = [0, 0]
+        self.ready_tail = [0, 0]
         
-    def sensor_a_generator(self):
-        """Generate sensor A messages every (9 ± 4) seconds"""
-        while True:
-            interarrival = random.uniform(SENSOR_A_MEAN - SENSOR_A_VAR, 
-                                         SENSOR_A_MEAN + SENSOR_A_VAR)
-            yield self.env.timeout(interarrival)
-            
-            self.sensor_a_generated += 1
-            msg_id = f"A-{self.sensor_a_generated}"
-            msg_type = 'A'
-            arrival_time = self.env.now
-            
-            print(f"[{self.env.now:.2f}] Sensor {msg_id} arrived")
-            
-            # Add to task buffer
-            self.task_buffer.append((msg_id, msg_type, arrival_time))
+        # Timing statistics, accumulated without keeping every sample
+        self.total_a_wait_times = RunningStats()
+        self.total_b_wait_times = RunningStats()
+        self.preprocess_times = RunningStats()
+        
+        # (time, event code, *values) records when tracing
+        self._trace = log.isEnabledFor(logging.DEBUG)
+        self.events = []
+        
+    def sensor_arrivals(self):
+        """Generate sensor A messages every (9 ± 4) seconds and sensor B
+        messages every 2 seconds, from the merged arrival table"""
+        env = self.env
+        for arrival, msg_type in zip(self._arrivals, self._arrival_types):
+            # Only the next arrival is ever on the event queue
+            yield env.timeout(arrival - env.now)
             
-            # Check if we have 4 messages for a task
-            if len(self.task_buffer) >= MESSAGES_PER_TASK:
-                task_messages = self.task_buffer[:MESSAGES_PER_TASK]
-                self.task_buffer = self.task_buffer[MESSAGES_PER_TASK:]
-                self.env.process(self.preprocess_task(task_messages))
+            if msg_type == TYPE_A:
+                self.sensor_a_generated += 1
+                self.add_message(TYPE_A, self.sensor_a_generated)
+            else:
+                self.sensor_b_generated += 1
+                self.add_message(TYPE_B, self.sensor_b_generated)
     
-    def sensor_b_generator(self):
-        """Generate sensor B messages every 2 seconds"""
-        while True:
-            yield self.env.timeout(SENSOR_B_INTERVAL)
-            
-            self.sensor_b_generated += 1
-            msg_id = f"B-{self.sensor_b_generated}"
-            msg_type = 'B'
-            arrival_time = self.env.now
-            
-            print(f"[{self.env.now:.2f}] Sensor {msg_id} arrived")
-            
-            # Add to task buffer
-            self.task_buffer.append((msg_id, msg_type, arrival_time))
-            
-            # Check if we have 4 messages for a task
-            if len(self.task_buffer) >= MESSAGES_PER_TASK:
-                task_messages = self.task_buffer[:MESSAGES_PER_TASK]
-                self.task_buffer = self.task_buffer[MESSAGES_PER_TASK:]
-                self.env.process(self.preprocess_task(task_messages))
+    def add_message(self, msg_type, number):
+        """Record an arriving message and start a task once 4 are buffered"""
+        now = self.env.now
+        i = self.n_messages
+        self.msg_type[i] = msg_type
+        self.msg_number[i] = number
+        self.msg_arrival[i] = now
+        self.n_messages = i + 1
+        
+        if self._trace:
+            self.events.append((now, EVT_ARRIVED, self.msg_id(i)))
+        
+        # Check if we have 4 messages for a task
+        if self.n_messages - self.n_grouped >= MESSAGES_PER_TASK:
+            first = self.n_grouped
+            self.n_grouped += MESSAGES_PER_TASK
+            self.env.process(self.preprocess_task(first))
+    
+    def msg_id(self, i):
+        """Name of message i as shown in the trace, e.g. A-3"""
+        return f"{TYPE_NAMES[self.msg_type[i]]}-{self.msg_number[i]}"
     
-    def preprocess_task(self, task_messages):
-        """Preprocess a task of 4 messages using one of 2 processors"""
-        task_start = self.env.now
+    def waiting(self, msg_type):
+        """Number of preprocessed messages of a type awaiting distribution"""
+        return self.ready_tail[msg_type] - self.ready_head[msg_type]
+    
+    def preprocess_task(self, first):
+        """Preprocess the task of 4 messages starting at index `first`,
+        using one of 2 processors"""
+        env = self.env
+        task_start = env.now
         
         # Randomly choose processor
-        if random.random() < 0.5:
+        if next(self._unit) < 0.5:
             processor = self.processor1
             proc_name = "Processor1"
         else:
@@ -124,85 +249,130 @@ class DataCollectionSystem:
         with processor.request() as req:
             yield req
             
-            print(f"[{self.env.now:.2f}] Task starting preprocessing on {proc_name}")
-            yield self.env.timeout(PREPROCESS_TIME)
+            if self._trace:
+                self.events.append((env.now, EVT_PREPROCESS_START, proc_name))
+            yield env.timeout(PREPROCESS_TIME)
             
             # Check for failure (24% chance)
-            if random.random() < PREPROCESS_FAILURE_RATE:
+            if next(self._unit) < PREPROCESS_FAILURE_RATE:
                 # Task failed, needs retry
                 self.tasks_failed += 1
-                print(f"[{self.env.now:.2f}] Task FAILED on {proc_name}, retrying...")
+                if self._trace:
+                    self.events.append((env.now, EVT_PREPROCESS_FAILED, proc_name))
                 # Retry immediately (as per problem statement)
-                yield self.env.timeout(PREPROCESS_TIME)  # Retry takes same time
+                yield env.timeout(PREPROCESS_TIME)  # Retry takes same time
                 self.tasks_retried += 1
-                print(f"[{self.env.now:.2f}] Task RETRY completed on {proc_name}")
+                if self._trace:
+                    self.events.append((env.now, EVT_RETRY_DONE, proc_name))
             
+            # No more yields: the time stays put for the rest of the task
+            now = env.now
             self.tasks_preprocessed += 1
-            preprocess_time = self.env.now - task_start
-            self.preprocess_times.append(preprocess_time)
+            preprocess_time = now - task_start
+            self.preprocess_times.add(preprocess_time)
+            
+            if self._trace:
+                self.events.append((now, EVT_PREPROCESSED, proc_name,
+                                    preprocess_time))
             
-            print(f"[{self.env.now:.2f}] Task preprocessing complete on {proc_name} "
-                  f"(time: {preprocess_time:.2f}s)")
+            # Wait times of the whole task at once
+            task = slice(first, first + MESSAGES_PER_TASK)
+            wait_times = (now - self.msg_arrival[task]).tolist()
             
             # Distribute messages to appropriate buffers
-            for msg_id, msg_type, arrival_time in task_messages:
-                wait_time = self.env.now - arrival_time
+            for i, msg_type, wait_time in zip(range(first, first + MESSAGES_PER_TASK),
+                                              self.msg_type[task].tolist(),
+                                              wait_times):
+                tail = self.ready_tail[msg_type]
+                self.ready[msg_type, tail] = i
+                self.ready_tail[msg_type] = tail + 1
                 
-                if msg_type == 'A':
-                    self.preprocessed_a.append((msg_id, self.env.now))
-                    self.total_a_wait_times.append(wait_time)
-                    print(f"[{self.env.now:.2f}] Message {msg_id} ready for distribution")
+                if msg_type == TYPE_A:
+                    self.total_a_wait_times.add(wait_time)
                 else:
-                    self.preprocessed_b.append((msg_id, self.env.now))
-                    self.total_b_wait_times.append(wait_time)
-                    print(f"[{self.env.now:.2f}] Message {msg_id} ready for distribution")
-                
-                # Check if we can form a distribution batch (2A + 3B)
-                self.try_distribute()
+                    self.total_b_wait_times.add(wait_time)
+                if self._trace:
+                    self.events.append((now, EVT_READY, self.msg_id(i)))
+            
+            # Form the distribution batches (2A + 3B) the task made possible
+            self.try_distribute()
     
     def try_distribute(self):
-        """Try to form a distribution batch with 2A + 3B messages"""
-        if len(self.preprocessed_a) >= A_FOR_DISTRIBUTION and \
-           len(self.preprocessed_b) >= B_FOR_DISTRIBUTION:
+        """Form distribution batches of 2A + 3B messages while enough wait"""
+        while self.waiting(TYPE_A) >= A_FOR_DISTRIBUTION and \
+              self.waiting(TYPE_B) >= B_FOR_DISTRIBUTION:
             
             # Take 2 A messages and 3 B messages
-            batch_a = self.preprocessed_a[:A_FOR_DISTRIBUTION]
-            batch_b = self.preprocessed_b[:B_FOR_DISTRIBUTION]
-            
-            self.preprocessed_a = self.preprocessed_a[A_FOR_DISTRIBUTION:]
-            self.preprocessed_b = self.preprocessed_b[B_FOR_DISTRIBUTION:]
+            head_a = self.ready_head[TYPE_A]
+            head_b = self.ready_head[TYPE_B]
+            self.ready_head[TYPE_A] = head_a + A_FOR_DISTRIBUTION
+            self.ready_head[TYPE_B] = head_b + B_FOR_DISTRIBUTION
+            batch_a = self.ready[TYPE_A, head_a:head_a + A_FOR_DISTRIBUTION].tolist()
+            batch_b = self.ready[TYPE_B, head_b:head_b + B_FOR_DISTRIBUTION].tolist()
             
             self.env.process(self.distribute_and_store(batch_a, batch_b))
     
     def distribute_and_store(self, batch_a, batch_b):
         """Distribute messages and store in dual storage"""
-        print(f"[{self.env.now:.2f}] Distribution batch forming: "
-              f"2A + 3B = {len(batch_a) + len(batch_b)} messages")
+        # Bound once per batch rather than looked up for every message
+        env = self.env
+        process = env.process
+        store = self._store
+        
+        if self._trace:
+            self.events.append((env.now, EVT_BATCH_FORMING,
+                                len(batch_a) + len(batch_b)))
         
         # Store each message in both main and backup storage
         all_messages = batch_a + batch_b
         
-        for msg_id, ready_time in all_messages:
-            # Store in main storage
-            with self.main_storage.request() as req:
-                yield req
-                yield self.env.timeout(STORAGE_TIME)
-            
-            # Store in backup storage (parallel or sequential)
-            with self.backup_storage.request() as req:
-                yield req
-                yield self.env.timeout(STORAGE_TIME)
+        for i in all_messages:
+            # Write to main and backup storage in parallel
+            yield simpy.AllOf(env, [process(store(self.main_storage)),
+                                    process(store(self.backup_storage))])
             
             self.messages_stored += 1
-            print(f"[{self.env.now:.2f}] Message {msg_id[0]} stored in dual storage")
+            if self._trace:
+                self.events.append((env.now, EVT_STORED,
+                                    TYPE_NAMES[self.msg_type[i]]))
         
         self.distributions_completed += 1
-        print(f"[{self.env.now:.2f}] Distribution batch complete: "
-              f"{len(all_messages)} messages stored")
+        if self._trace:
+            self.events.append((env.now, EVT_BATCH_DONE, len(all_messages)))
+    
+    def _store(self, storage):
+        """Write one message to a storage unit"""
+        timeout = self.env.timeout
+        with storage.request() as req:
+            yield req
+            yield timeout(STORAGE_TIME)
+
+
+def log_events(events):
+    """Log the recorded event trace"""
+    for time, code, *values in events:
+        log.debug("[%.2f] " + EVENT_FORMATS[code], time, *values)
+
 
+def simulate(seed=SEED):
+    """Run one seeded 4-hour replication, without printing"""
+    env = simpy.Environment()
+    system = DataCollectionSystem(env, seed)
+    
+    # Start the arrivals of both sensors
+    env.process(system.sensor_arrivals())
+    
+    # Run simulation
+    env.run(until=SIMULATION_TIME)
+    return system
 
-def run_simulation():
+
+def run_simulation(seed=SEED):
     """Run the data collection system simulation"""
+    # Trace level from the environment, e.g. SIM_LOG_LEVEL=DEBUG
+    logging.basicConfig(level=os.environ.get("SIM_LOG_LEVEL", "WARNING").upper(),
+                        format="%(message)s", stream=sys.stdout)
+    
     print("=" * 70)
     print("TOPIC 9: DATA COLLECTION SYSTEM SIMULATION")
     print("=" * 70)
@@ -214,15 +384,8 @@ def run_simulation():
     print(f"Distribution: {A_FOR_DISTRIBUTION}A + {B_FOR_DISTRIBUTION}B messages")
     print("=" * 70)
     
-    env = simpy.Environment()
-    system = DataCollectionSystem(env)
-    
-    # Start sensor generators
-    env.process(system.sensor_a_generator())
-    env.process(system.sensor_b_generator())
-    
-    # Run simulation
-    env.run(until=SIMULATION_TIME)
+    system = simulate(seed)
+    log_events(system.events)
     
     # Print results
     print("\n" + "=" * 70)
@@ -238,25 +401,25 @@ def run_simulation():
     print(f"  Tasks preprocessed: {system.tasks_preprocessed}")
     print(f"  Tasks failed (24%): {system.tasks_failed}")
     print(f"  Tasks retried: {system.tasks_retried}")
-    if system.preprocess_times:
-        print(f"  Average preprocessing time: {np.mean(system.preprocess_times):.2f}s")
+    if system.preprocess_times.n:
+        print(f"  Average preprocessing time: {system.preprocess_times.mean:.2f}s")
     
     print(f"\nDistribution Statistics:")
     print(f"  Distribution batches completed: {system.distributions_completed}")
     print(f"  Messages stored in dual storage: {system.messages_stored}")
     
     print(f"\nWait Times:")
-    if system.total_a_wait_times:
-        print(f"  Sensor A: avg={np.mean(system.total_a_wait_times):.2f}s, "
-              f"max={np.max(system.total_a_wait_times):.2f}s")
-    if system.total_b_wait_times:
-        print(f"  Sensor B: avg={np.mean(system.total_b_wait_times):.2f}s, "
-              f"max={np.max(system.total_b_wait_times):.2f}s")
+    if system.total_a_wait_times.n:
+        print(f"  Sensor A: avg={system.total_a_wait_times.mean:.2f}s, "
+              f"max={system.total_a_wait_times.max:.2f}s")
+    if system.total_b_wait_times.n:
+        print(f"  Sensor B: avg={system.total_b_wait_times.mean:.2f}s, "
+              f"max={system.total_b_wait_times.max:.2f}s")
     
     print(f"\nBuffer Status at end:")
-    print(f"  Messages in task buffer: {len(system.task_buffer)}")
-    print(f"  Preprocessed A waiting: {len(system.preprocessed_a)}")
-    print(f"  Preprocessed B waiting: {len(system.preprocessed_b)}")
+    print(f"  Messages in task buffer: {system.n_messages - system.n_grouped}")
+    print(f"  Preprocessed A waiting: {system.waiting(TYPE_A)}")
+    print(f"  Preprocessed B waiting: {system.waiting(TYPE_B)}")
     
     # Save results
     with open('simulation_results.txt', 'w', encoding='utf-8') as f:
@@ -273,6 +436,60 @@ def run_simulation():
     return system
 
 
+def replicate(seed):
+    """Statistics of one replication, as plain values for the process pool"""
+    system = simulate(seed)
+    return {
+        'tasks_preprocessed': system.tasks_preprocessed,
+        'tasks_failed': system.tasks_failed,
+        'distributions_completed': system.distributions_completed,
+        'messages_stored': system.messages_stored,
+        'preprocess_times': system.preprocess_times,
+        'total_a_wait_times': system.total_a_wait_times,
+        'total_b_wait_times': system.total_b_wait_times,
+    }
+
+
+def run_many(n_reps):
+    """Run independent replications in parallel, one seed per replication"""
+    seeds = range(SEED, SEED + n_reps)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(replicate, seeds))
+    
+    print("=" * 70)
+    print("TOPIC 9: DATA COLLECTION SYSTEM - REPLICATIONS")
+    print("=" * 70)
+    print(f"Replications: {n_reps} x {SIMULATION_HOURS} hours (seeds {SEED}..{SEED + n_reps - 1})")
+    
+    print(f"\nAverage per replication:")
+    for key, label in [('tasks_preprocessed', "Tasks preprocessed"),
+                       ('tasks_failed', "Tasks failed (24%)"),
+                       ('distributions_completed', "Distribution batches completed"),
+                       ('messages_stored', "Messages stored in dual storage")]:
+        print(f"  {label}: {np.mean([r[key] for r in results]):.1f}")
+    
+    print(f"\nWait Times:")
+    for key, label in [('total_a_wait_times', "Sensor A"),
+                       ('total_b_wait_times', "Sensor B")]:
+        waits = RunningStats()
+        for r in results:
+            waits.merge(r[key])
+        if waits.n:
+            print(f"  {label}: avg={waits.mean:.2f}s, max={waits.max:.2f}s")
+            if n_reps > 1:
+                means = np.array([r[key].mean for r in results])
+                half_width = 1.96 * means.std(ddof=1) / np.sqrt(n_reps)
+                print(f"    95% CI of the mean: {means.mean():.2f} +/- {half_width:.2f}s")
+    return results
+
+
 if __name__ == "__main__":
-    random.seed(42)
-    run_simulation()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--replications", type=int, default=0,
+                        help="run this many replications in parallel")
+    args = parser.parse_args()
+    
+    if args.replications > 0:
+        run_many(args.replications)
+    else:
+        run_simulation()
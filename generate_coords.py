@@ -2,37 +2,29 @@ import numpy as np
 
 def generate_histogram_coords(filename, bins=10):
     try:
-        data = []
-        with open(filename, 'r') as f:
-            for line in f:
-                data.append(float(line.strip()))
+        data = np.loadtxt(filename, ndmin=1)
         
-        if not data:
+        if not data.size:
             return ""
             
         hist, bin_edges = np.histogram(data, bins=bins)
         
-        coords = ""
-        for i in range(len(hist)):
-            # x is center of bin
-            x = (bin_edges[i] + bin_edges[i+1]) / 2
-            y = hist[i]
-            coords += f"({x:.1f}, {y}) "
-        return coords
+        # x is center of bin
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        return "".join(f"({x:.1f}, {y}) " for x, y in zip(centers, hist))
     except Exception as e:
         return f"Error: {e}"
 
 def generate_scatter_coords(filename, stride=10):
     try:
-        coords = ""
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-            
-        for i, line in enumerate(lines):
-            if i % stride == 0: # Take every nth point to avoid overcrowding
-                val = float(line.strip())
-                coords += f"({i+1}, {val:.2f}) "
-        return coords
+        data = np.loadtxt(filename, ndmin=1)
+        # Take every nth point to avoid overcrowding
+        values = data[::stride].tolist()
+        # One slot per point, so the list never has to grow
+        parts = [None] * len(values)
+        for k, (i, val) in enumerate(zip(range(1, len(data) + 1, stride), values)):
+            parts[k] = f"({i}, {val:.2f}) "
+        return "".join(parts)
     except Exception as e:
         return f"Error: {e}"
 
@@ -49,9 +41,3 @@ with open(r"c:\Users\alext\Documents\Downloads\Лекционни материа
     f.write(coords5)
     f.write("\nTOPIC 31:\n")
     f.write(coords31)
-
-with open(r"c:\Users\alext\Documents\Downloads\Лекционни материали-20260209\coords.txt", "w") as f:
-    f.write("TOPIC 5:\n")
-    f.write(coords5)
-    f.write("\nTOPIC 31:\n")
-    f.write(coords31)
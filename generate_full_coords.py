@@ -1,15 +1,15 @@
+import numpy as np
 
 def generate_scatter_coords(filename, stride=1):
     try:
-        coords = ""
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-            
-        for i, line in enumerate(lines):
-            if i % stride == 0: 
-                val = float(line.strip())
-                coords += f"({i+1}, {val:.2f}) "
-        return coords
+        data = np.loadtxt(filename, ndmin=1)
+        # Take every nth point to avoid overcrowding
+        values = data[::stride].tolist()
+        # One slot per point, so the list never has to grow
+        parts = [None] * len(values)
+        for k, (i, val) in enumerate(zip(range(1, len(data) + 1, stride), values)):
+            parts[k] = f"({i}, {val:.2f}) "
+        return "".join(parts)
     except Exception as e:
         return f"Error: {e}"
 